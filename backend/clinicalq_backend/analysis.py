@@ -1,56 +1,83 @@
 from __future__ import annotations
 
 import math
-from dataclasses import asdict
-from typing import Any, Dict, Iterable, List
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Tuple
 
 import numpy as np
 
-from clinicalq_backend.types import MetricResult, SessionResult
+from clinicalq_backend.types import MetricResult, SessionFeatureTable, SessionResult, metric_to_dict
+
+# Every status assigned by this module is one of these interned objects, so
+# status checks below compare by identity.
+STATUS_IN_RANGE = sys.intern("IN_RANGE")
+STATUS_OUT_OF_RANGE = sys.intern("OUT_OF_RANGE")
+STATUS_MISSING = sys.intern("MISSING")
 
 
 def _safe_div(num: float, den: float) -> float:
     if den == 0.0:
-        return float("nan")
+        return math.nan
     return num / den
 
 
 def _pct_change(new_value: float, base_value: float) -> float:
     if base_value == 0.0:
-        return float("nan")
+        return math.nan
     return (new_value - base_value) / base_value * 100.0
 
 
 def _pct_drop(before: float, after: float) -> float:
     if before == 0.0:
-        return float("nan")
+        return math.nan
     return (before - after) / before * 100.0
 
 
-def _mean_features(items: Iterable[Dict[str, float]]) -> Dict[str, float]:
-    rows = [x for x in items if x]
-    if not rows:
-        return {}
-    keys = rows[0].keys()
-    return {k: float(np.mean([row.get(k, float("nan")) for row in rows])) for k in keys}
-
-
 def _status_for_lt(value: float, limit: float) -> str:
-    if math.isnan(value):
-        return "MISSING"
-    return "IN_RANGE" if value < limit else "OUT_OF_RANGE"
+    if value != value:  # NaN; cheaper than math.isnan on this per-metric path
+        return STATUS_MISSING
+    return STATUS_IN_RANGE if value < limit else STATUS_OUT_OF_RANGE
 
 
 def _status_for_gt(value: float, limit: float) -> str:
-    if math.isnan(value):
-        return "MISSING"
-    return "IN_RANGE" if value > limit else "OUT_OF_RANGE"
+    if value != value:
+        return STATUS_MISSING
+    return STATUS_IN_RANGE if value > limit else STATUS_OUT_OF_RANGE
 
 
 def _status_for_between(value: float, low: float, high: float) -> str:
-    if math.isnan(value):
-        return "MISSING"
-    return "IN_RANGE" if low <= value <= high else "OUT_OF_RANGE"
+    if value != value:
+        return STATUS_MISSING
+    return STATUS_IN_RANGE if low <= value <= high else STATUS_OUT_OF_RANGE
+
+
+_STATUS_LABELS = (STATUS_MISSING, STATUS_IN_RANGE, STATUS_OUT_OF_RANGE)
+
+
+def _statuses(values: Iterable[float], kind: str, low: float, high: float = math.nan) -> List[str]:
+    """Vectorized _status_for_* over a batch of values sharing one normal range."""
+    v = np.asarray(list(values), dtype=np.float64)
+    if kind == "lt":
+        in_range = v < low
+    elif kind == "le":
+        in_range = v <= low
+    elif kind == "between":
+        in_range = (v >= low) & (v <= high)
+    else:
+        raise ValueError(f"Unsupported status kind: {kind}")
+    nan_mask = np.isnan(v)
+    codes = np.where(nan_mask, 0, np.where(in_range, 1, 2))
+    return [_STATUS_LABELS[code] for code in codes.tolist()]
+
+
+def _optional_float(value: float | None) -> float | None:
+    if value is None:
+        return None
+    value = float(value)
+    return None if value != value else value
 
 
 def _as_metric(
@@ -68,9 +95,9 @@ def _as_metric(
     return MetricResult(
         location=location,
         metric=metric,
-        value=float(value) if not math.isnan(value) else float("nan"),
-        left_value=None if left_value is None or math.isnan(float(left_value)) else float(left_value),
-        right_value=None if right_value is None or math.isnan(float(right_value)) else float(right_value),
+        value=float(value),
+        left_value=_optional_float(left_value),
+        right_value=_optional_float(right_value),
         normal_range=normal_range,
         status=status,
         probe=probe,
@@ -78,115 +105,193 @@ def _as_metric(
     )
 
 
+def build_feature_table(epochs: Iterable[Dict[str, Any]]) -> SessionFeatureTable:
+    """Pack epoch dicts (as stored in session results) into a SessionFeatureTable."""
+    epochs = list(epochs)
+    locations: Dict[str, int] = {}
+    bands: Dict[str, int] = {}
+    for epoch in epochs:
+        for location, features in epoch.get("features", {}).items():
+            locations.setdefault(location, len(locations))
+            if features and not bands.keys() >= features.keys():
+                for band in features:
+                    bands.setdefault(band, len(bands))
+
+    # Interned so condition dicts share key objects with freshly extracted features.
+    band_names = [sys.intern(band) for band in bands]
+    n_epochs = len(epochs)
+    values = np.full((len(locations), len(band_names), n_epochs), np.nan)
+    present = np.zeros(values.shape, dtype=bool)
+    captured = np.zeros((len(locations), n_epochs), dtype=bool)
+
+    # Gather cells in Python lists and scatter them into the arrays in one go.
+    rows: List[int] = []
+    cols: List[int] = []
+    cell_values: List[List[float]] = []
+    cell_present: List[List[bool]] = []
+    all_present = [True] * len(band_names)
+    for col, epoch in enumerate(epochs):
+        for location, features in epoch.get("features", {}).items():
+            captured[locations[location], col] = True
+            if not features:
+                continue
+            rows.append(locations[location])
+            cols.append(col)
+            if features.keys() == bands.keys():
+                cell_values.append(list(map(features.__getitem__, band_names)))
+                cell_present.append(all_present)
+            else:
+                cell_values.append([features.get(band, math.nan) for band in band_names])
+                cell_present.append([band in features for band in band_names])
+    if rows:
+        values[rows, :, cols] = cell_values
+        present[rows, :, cols] = cell_present
+
+    return SessionFeatureTable(
+        locations=list(locations),
+        bands=band_names,
+        sequences=np.array([epoch.get("sequence") for epoch in epochs], dtype=object),
+        epoch_indices=np.array([int(epoch.get("index", -1)) for epoch in epochs], dtype=np.int64),
+        epoch_labels=np.array([epoch.get("label") for epoch in epochs], dtype=object),
+        values=values,
+        present=present,
+        captured=captured,
+    )
+
+
+@dataclass(slots=True)
+class _EpochIndex:
+    table: SessionFeatureTable
+    rows: Dict[str, int] = field(default_factory=dict)
+    by_index: Dict[Tuple[str, Any, int], int] = field(default_factory=dict)
+    by_label: Dict[Tuple[str, Any, Any], List[int]] = field(default_factory=dict)
+    sequences: Dict[str, set[str]] = field(default_factory=dict)
+
+
+def _index_epochs(table: SessionFeatureTable) -> _EpochIndex:
+    lookup = _EpochIndex(table=table, rows={location: row for row, location in enumerate(table.locations)})
+    indices = table.epoch_indices.tolist()
+    for row, location in enumerate(table.locations):
+        for col in np.flatnonzero(table.captured[row]).tolist():
+            sequence = table.sequences[col]
+            # First match wins, mirroring a linear scan over the epoch list.
+            lookup.by_index.setdefault((location, sequence, indices[col]), col)
+            lookup.by_label.setdefault((location, sequence, table.epoch_labels[col]), []).append(col)
+            lookup.sequences.setdefault(location, set()).add(str(sequence))
+    return lookup
+
+
 def _find_epoch(
-    epochs: List[Dict[str, Any]],
+    lookup: _EpochIndex,
     location: str,
     *,
-    sequence: str | None = None,
+    sequence: str,
     label: str | None = None,
     index: int | None = None,
-) -> Dict[str, Any] | None:
-    for epoch in epochs:
-        if location not in epoch.get("features", {}):
-            continue
-        if sequence and epoch.get("sequence") != sequence:
-            continue
-        if label and epoch.get("label") != label:
-            continue
-        if index is not None and int(epoch.get("index", -1)) != index:
-            continue
-        return epoch
+) -> int | None:
+    if index is not None:
+        return lookup.by_index.get((location, sequence, index))
+    if label:
+        matches = lookup.by_label.get((location, sequence, label))
+        return matches[0] if matches else None
     return None
 
 
 def _find_epochs(
-    epochs: List[Dict[str, Any]],
+    lookup: _EpochIndex,
     location: str,
     *,
-    sequence: str | None = None,
-    labels: set[str] | None = None,
-    indices: set[int] | None = None,
-) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
-    for epoch in epochs:
-        if location not in epoch.get("features", {}):
-            continue
-        if sequence and epoch.get("sequence") != sequence:
-            continue
-        if labels is not None and epoch.get("label") not in labels:
-            continue
-        if indices is not None and int(epoch.get("index", -1)) not in indices:
-            continue
-        out.append(epoch)
-    return out
+    sequence: str,
+    labels: set[str],
+) -> List[int]:
+    return sorted(col for label in labels for col in lookup.by_label.get((location, sequence, label), []))
 
 
-def _epoch_features(epoch: Dict[str, Any] | None, location: str) -> Dict[str, float]:
-    if not epoch:
+def _epoch_features(lookup: _EpochIndex, col: int | None, location: str) -> Dict[str, float]:
+    if col is None:
+        return {}
+    row = lookup.rows[location]
+    table = lookup.table
+    values = table.values[row, :, col].tolist()
+    mask = table.present[row, :, col].tolist()
+    return {band: value for band, value, ok in zip(table.bands, values, mask) if ok}
+
+
+def _mean_features(lookup: _EpochIndex, location: str, cols: Iterable[int | None]) -> Dict[str, float]:
+    """Average the given epochs' features; epochs without any features are skipped."""
+    row = lookup.rows.get(location)
+    if row is None:
+        return {}
+    table = lookup.table
+    present = table.present[row]
+    cols = [col for col in cols if col is not None]
+    if cols:
+        has_features = present[:, cols].any(axis=0).tolist()
+        cols = [col for col, ok in zip(cols, has_features) if ok]
+    if not cols:
         return {}
-    return dict(epoch["features"].get(location, {}))
+    # Keys follow the first epoch; bands it lacks elsewhere average in as NaN.
+    keys = present[:, cols[0]]
+    means = np.mean(table.values[row][keys][:, cols], axis=-1)
+    return dict(zip([band for band, ok in zip(table.bands, keys.tolist()) if ok], means.tolist()))
 
 
-def _location_sequences(epochs: List[Dict[str, Any]], location: str) -> set[str]:
-    return {str(ep.get("sequence")) for ep in epochs if location in ep.get("features", {})}
+def _location_sequences(lookup: _EpochIndex, location: str) -> set[str]:
+    return lookup.sequences.get(location, set())
 
 
-def _resolve_cz_conditions(epochs: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
-    sequences = _location_sequences(epochs, "Cz")
+def _resolve_cz_conditions(lookup: _EpochIndex) -> Dict[str, Dict[str, float]]:
+    sequences = _location_sequences(lookup, "Cz")
     seq = "Cz" if "Cz" in sequences else "MASTER"
 
     eo_before = _mean_features(
-        [
-            _epoch_features(_find_epoch(epochs, "Cz", sequence=seq, index=1), "Cz"),
-            _epoch_features(_find_epoch(epochs, "Cz", sequence=seq, index=2), "Cz"),
-        ]
+        lookup,
+        "Cz",
+        [_find_epoch(lookup, "Cz", sequence=seq, index=1), _find_epoch(lookup, "Cz", sequence=seq, index=2)],
     )
-    eo_after = _epoch_features(_find_epoch(epochs, "Cz", sequence=seq, index=4), "Cz")
-    ec = _epoch_features(_find_epoch(epochs, "Cz", sequence=seq, index=3), "Cz")
+    eo_after = _epoch_features(lookup, _find_epoch(lookup, "Cz", sequence=seq, index=4), "Cz")
+    ec = _epoch_features(lookup, _find_epoch(lookup, "Cz", sequence=seq, index=3), "Cz")
 
-    ut_epochs = _find_epochs(epochs, "Cz", sequence=seq, labels={"READ", "COUNT"})
-    ut = _mean_features([ep["features"]["Cz"] for ep in ut_epochs])
-    omni = _epoch_features(_find_epoch(epochs, "Cz", sequence=seq, label="OMNI"), "Cz")
+    ut = _mean_features(lookup, "Cz", _find_epochs(lookup, "Cz", sequence=seq, labels={"READ", "COUNT"}))
+    omni = _epoch_features(lookup, _find_epoch(lookup, "Cz", sequence=seq, label="OMNI"), "Cz")
 
     return {"EO": eo_before, "EO_AFTER": eo_after, "EC": ec, "UT": ut, "OMNI": omni}
 
 
-def _resolve_o1_conditions(epochs: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
-    sequences = _location_sequences(epochs, "O1")
+def _resolve_o1_conditions(lookup: _EpochIndex) -> Dict[str, Dict[str, float]]:
+    sequences = _location_sequences(lookup, "O1")
     if "O1" in sequences:
         seq = "O1"
         eo_before = _mean_features(
-            [
-                _epoch_features(_find_epoch(epochs, "O1", sequence=seq, index=1), "O1"),
-                _epoch_features(_find_epoch(epochs, "O1", sequence=seq, index=2), "O1"),
-            ]
+            lookup,
+            "O1",
+            [_find_epoch(lookup, "O1", sequence=seq, index=1), _find_epoch(lookup, "O1", sequence=seq, index=2)],
         )
-        eo_after = _epoch_features(_find_epoch(epochs, "O1", sequence=seq, index=4), "O1")
-        ec = _epoch_features(_find_epoch(epochs, "O1", sequence=seq, index=3), "O1")
+        eo_after = _epoch_features(lookup, _find_epoch(lookup, "O1", sequence=seq, index=4), "O1")
+        ec = _epoch_features(lookup, _find_epoch(lookup, "O1", sequence=seq, index=3), "O1")
     else:
         seq = "MASTER"
         eo_before = _mean_features(
-            [
-                _epoch_features(_find_epoch(epochs, "O1", sequence=seq, index=1), "O1"),
-                _epoch_features(_find_epoch(epochs, "O1", sequence=seq, index=2), "O1"),
-            ]
+            lookup,
+            "O1",
+            [_find_epoch(lookup, "O1", sequence=seq, index=1), _find_epoch(lookup, "O1", sequence=seq, index=2)],
         )
-        eo_after = _epoch_features(_find_epoch(epochs, "O1", sequence=seq, index=4), "O1")
-        ec = _epoch_features(_find_epoch(epochs, "O1", sequence=seq, index=3), "O1")
+        eo_after = _epoch_features(lookup, _find_epoch(lookup, "O1", sequence=seq, index=4), "O1")
+        ec = _epoch_features(lookup, _find_epoch(lookup, "O1", sequence=seq, index=3), "O1")
 
     return {"EO": eo_before, "EO_AFTER": eo_after, "EC": ec}
 
 
-def _resolve_front_ec(epochs: List[Dict[str, Any]], location: str) -> Dict[str, float]:
-    seqs = _location_sequences(epochs, location)
+def _resolve_front_ec(lookup: _EpochIndex, location: str) -> Dict[str, float]:
+    seqs = _location_sequences(lookup, location)
     if location in seqs:
-        return _epoch_features(_find_epoch(epochs, location, sequence=location, index=1), location)
+        return _epoch_features(lookup, _find_epoch(lookup, location, sequence=location, index=1), location)
 
-    frontal = _epoch_features(_find_epoch(epochs, location, sequence="MASTER", label="FRONTAL_EC"), location)
+    frontal = _epoch_features(lookup, _find_epoch(lookup, location, sequence="MASTER", label="FRONTAL_EC"), location)
     if frontal:
         return frontal
 
-    return _epoch_features(_find_epoch(epochs, location, sequence="MASTER", label="EC"), location)
+    return _epoch_features(lookup, _find_epoch(lookup, location, sequence="MASTER", label="EC"), location)
 
 
 def _probe_join(*items: str) -> str:
@@ -210,9 +315,9 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
     beta_fatigue = _pct_drop(eo.get("beta", 0.0), ut.get("beta", 0.0))
     tb_challenge_shift = _pct_drop(tb_eo, tb_ut)
     theta_omni_change = _pct_change(omni.get("theta", 0.0), eo.get("theta", 0.0))
-    total_amp_ec = ec.get("total_amp_basic", float("nan"))
-    peak_alpha_ec = ec.get("peak_alpha", float("nan"))
-    peak_alpha_eo = eo.get("peak_alpha", float("nan"))
+    total_amp_ec = ec.get("total_amp_basic", math.nan)
+    peak_alpha_ec = ec.get("peak_alpha", math.nan)
+    peak_alpha_eo = eo.get("peak_alpha", math.nan)
 
     out: List[MetricResult] = []
 
@@ -225,7 +330,7 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             "> 30%",
             status,
             "Ask about visual processing and short-term retention issues; screen for recent severe emotional stressors."
-            if status == "OUT_OF_RANGE"
+            if status is STATUS_OUT_OF_RANGE
             else "",
             "(Alpha_EC - Alpha_EO) / Alpha_EO * 100",
         )
@@ -240,7 +345,7 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             "< 25%",
             status,
             "Ask about foggy thinking, cognitive decline, sleep disturbance, medication effects, sleep deprivation, or marijuana use."
-            if status == "OUT_OF_RANGE"
+            if status is STATUS_OUT_OF_RANGE
             else "",
             "(Alpha_EO_before - Alpha_EO_after) / Alpha_EO_before * 100",
         )
@@ -255,7 +360,7 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             "< 3.0",
             status,
             "Ask about inability to sit still, sleep onset issues, headaches/chronic pain, tremor, dystonia, and motor-linked seizure features."
-            if status == "OUT_OF_RANGE"
+            if status is STATUS_OUT_OF_RANGE
             else "",
             "Theta_EC / SMR_EC",
         )
@@ -263,7 +368,7 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
 
     status = _status_for_lt(tb_eo, 2.2)
     probe = ""
-    if status == "OUT_OF_RANGE":
+    if status is STATUS_OUT_OF_RANGE:
         probe = "Ask about focus and attention inefficiency (CADD profile)."
         if tb_eo > 3.0:
             probe = _probe_join(probe, "If >3.0, ask about ADHD-like presentation.")
@@ -271,7 +376,7 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
 
     status = _status_for_lt(tb_ut, 2.2)
     probe = ""
-    if status == "OUT_OF_RANGE":
+    if status is STATUS_OUT_OF_RANGE:
         probe = "Ask about CADD traits and fatigue under cognitive load."
         if tb_ut > 3.0:
             probe = _probe_join(probe, "If >3.0, ask about ADHD-like presentation.")
@@ -290,7 +395,7 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             beta_fatigue,
             "< 15%",
             status,
-            "Ask whether reading/problem solving quickly causes fatigue." if status == "OUT_OF_RANGE" else "",
+            "Ask whether reading/problem solving quickly causes fatigue." if status is STATUS_OUT_OF_RANGE else "",
             "(Beta_EO - Beta_UT) / Beta_EO * 100",
         )
     )
@@ -303,7 +408,7 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             beta_activation,
             "< 20%",
             status,
-            "If >20%, ask about over-arousal/anxiety under cognitive load." if status == "OUT_OF_RANGE" else "",
+            "If >20%, ask about over-arousal/anxiety under cognitive load." if status is STATUS_OUT_OF_RANGE else "",
             "(Beta_UT - Beta_EO) / Beta_EO * 100",
         )
     )
@@ -316,14 +421,14 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             tb_challenge_shift,
             "< 15%",
             status,
-            "Ask about CADD if task-related shift is elevated." if status == "OUT_OF_RANGE" else "",
+            "Ask about CADD if task-related shift is elevated." if status is STATUS_OUT_OF_RANGE else "",
             "(T/B_EO - T/B_UT) / (T/B_EO) * 100",
         )
     )
 
     status = _status_for_lt(theta_omni_change, -5.0)
     probe = ""
-    if status == "OUT_OF_RANGE":
+    if status is STATUS_OUT_OF_RANGE:
         if theta_omni_change > 0.0:
             probe = "Theta increased with Omni/UCS; avoid prescribing that sound for home use."
         else:
@@ -349,7 +454,7 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             "< 60 uV",
             status,
             "Ask about developmental delay, autism-spectrum behaviors, and marked cognitive deficits."
-            if status == "OUT_OF_RANGE"
+            if status is STATUS_OUT_OF_RANGE
             else "",
             "Theta_EC + Alpha_EC + Beta_EC",
         )
@@ -363,7 +468,7 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             peak_alpha_ec,
             "> 9.5 Hz",
             status,
-            "Ask about mental sluggishness." if status == "OUT_OF_RANGE" else "",
+            "Ask about mental sluggishness." if status is STATUS_OUT_OF_RANGE else "",
             "Peak frequency of Alpha_EC",
         )
     )
@@ -376,7 +481,7 @@ def _analyze_cz(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             peak_alpha_eo,
             "> 9.5 Hz",
             status,
-            "Ask about mental sluggishness." if status == "OUT_OF_RANGE" else "",
+            "Ask about mental sluggishness." if status is STATUS_OUT_OF_RANGE else "",
             "Peak frequency of Alpha_EO",
         )
     )
@@ -394,15 +499,15 @@ def _analyze_o1(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
     tb_eo = _safe_div(eo.get("theta", 0.0), eo.get("beta", 0.0))
     tb_ec = _safe_div(ec.get("theta", 0.0), ec.get("beta", 0.0))
     tb_shift = _pct_drop(tb_eo, tb_ec)
-    total_amp_ec = ec.get("total_amp_basic", float("nan"))
-    peak_alpha_ec = ec.get("peak_alpha", float("nan"))
-    peak_alpha_eo = eo.get("peak_alpha", float("nan"))
+    total_amp_ec = ec.get("total_amp_basic", math.nan)
+    peak_alpha_ec = ec.get("peak_alpha", math.nan)
+    peak_alpha_eo = eo.get("peak_alpha", math.nan)
 
     out: List[MetricResult] = []
 
     status = _status_for_gt(alpha_response, 50.0)
     probe = ""
-    if status == "OUT_OF_RANGE":
+    if status is STATUS_OUT_OF_RANGE:
         probe = "Ask about traumatic stress and poor retention of information."
     elif alpha_response >= 150.0:
         probe = "Very high alpha response can correlate with strong artistic/visual-spatial interests."
@@ -427,7 +532,7 @@ def _analyze_o1(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             "< 25%",
             status,
             "Ask about foggy thinking, cognitive decline, sleep issues, and medication effects."
-            if status == "OUT_OF_RANGE"
+            if status is STATUS_OUT_OF_RANGE
             else "",
             "(Alpha_EO_before - Alpha_EO_after) / Alpha_EO_before * 100",
         )
@@ -435,7 +540,7 @@ def _analyze_o1(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
 
     status = _status_for_between(tb_eo, 1.8, 2.2)
     probe = ""
-    if status == "OUT_OF_RANGE":
+    if status is STATUS_OUT_OF_RANGE:
         if tb_eo < 1.8:
             probe = "Ask about poor stress tolerance, racing thoughts, anxiety, self-quieting difficulty, sleep problems, and depressive symptoms."
             if tb_eo < 1.2:
@@ -448,7 +553,7 @@ def _analyze_o1(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
 
     status = _status_for_between(tb_ec, 1.8, 2.2)
     probe = ""
-    if status == "OUT_OF_RANGE":
+    if status is STATUS_OUT_OF_RANGE:
         if tb_ec <= 1.5:
             probe = "Low EC theta/beta can track sleep disturbance; compare with EO findings."
         elif tb_ec > 3.0:
@@ -459,7 +564,7 @@ def _analyze_o1(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
 
     status = _status_for_gt(tb_shift, -25.0)
     probe = ""
-    if status == "OUT_OF_RANGE":
+    if status is STATUS_OUT_OF_RANGE:
         probe = "If < -25%, ask about sleep-onset difficulties."
     elif tb_shift > 0:
         probe = "Positive value indicates theta/beta decreased from EO to EC."
@@ -484,7 +589,7 @@ def _analyze_o1(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             "< 60 uV",
             status,
             "Ask about developmental delay, autism-spectrum features, and marked cognitive deficits."
-            if status == "OUT_OF_RANGE"
+            if status is STATUS_OUT_OF_RANGE
             else "",
             "Theta_EC + Alpha_EC + Beta_EC",
         )
@@ -498,7 +603,7 @@ def _analyze_o1(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             peak_alpha_ec,
             "> 9.5 Hz",
             status,
-            "Ask about mental sluggishness." if status == "OUT_OF_RANGE" else "",
+            "Ask about mental sluggishness." if status is STATUS_OUT_OF_RANGE else "",
             "Peak frequency of Alpha_EC",
         )
     )
@@ -511,7 +616,7 @@ def _analyze_o1(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
             peak_alpha_eo,
             "> 9.5 Hz",
             status,
-            "Ask about mental sluggishness." if status == "OUT_OF_RANGE" else "",
+            "Ask about mental sluggishness." if status is STATUS_OUT_OF_RANGE else "",
             "Peak frequency of Alpha_EO",
         )
     )
@@ -522,12 +627,18 @@ def _analyze_o1(conditions: Dict[str, Dict[str, float]]) -> List[MetricResult]:
 def _analyze_frontal_pair(f3: Dict[str, float], f4: Dict[str, float]) -> List[MetricResult]:
     out: List[MetricResult] = []
 
-    for location, data in (("F3", f3), ("F4", f4)):
-        tb = _safe_div(data.get("theta", 0.0), data.get("beta", 0.0))
-        ta = _safe_div(data.get("theta", 0.0), data.get("alpha", 0.0))
-        total = data.get("total_amp_basic", float("nan"))
+    pair = (("F3", f3), ("F4", f4))
+    tbs = [_safe_div(data.get("theta", 0.0), data.get("beta", 0.0)) for _, data in pair]
+    tas = [_safe_div(data.get("theta", 0.0), data.get("alpha", 0.0)) for _, data in pair]
+    totals = [data.get("total_amp_basic", math.nan) for _, data in pair]
+    tb_statuses = _statuses(tbs, "lt", 2.2)
+    ta_statuses = _statuses(tas, "between", 1.2, 1.6)
+    total_statuses = _statuses(totals, "lt", 60.0)
 
-        status = _status_for_lt(tb, 2.2)
+    for i, (location, _) in enumerate(pair):
+        tb, ta, total = tbs[i], tas[i], totals[i]
+
+        status = tb_statuses[i]
         out.append(
             _as_metric(
                 location,
@@ -536,15 +647,15 @@ def _analyze_frontal_pair(f3: Dict[str, float], f4: Dict[str, float]) -> List[Me
                 "< 2.2",
                 status,
                 "Ask about retrieval deficits, impulse control difficulty, emotional volatility, depression (adults), or impulse control (children)."
-                if status == "OUT_OF_RANGE"
+                if status is STATUS_OUT_OF_RANGE
                 else "",
                 "Theta_EC / Beta_EC",
             )
         )
 
-        status = _status_for_between(ta, 1.2, 1.6)
+        status = ta_statuses[i]
         probe = ""
-        if status == "OUT_OF_RANGE":
+        if status is STATUS_OUT_OF_RANGE:
             if ta < 1.0:
                 probe = "Ask about frontal Alpha ADD profile: organization, sequencing, sustained focus, planning, completion, and talkativeness."
                 if ta < 0.8:
@@ -553,7 +664,7 @@ def _analyze_frontal_pair(f3: Dict[str, float], f4: Dict[str, float]) -> List[Me
                 probe = "Outside frontal theta/alpha target range; correlate with executive function complaints."
         out.append(_as_metric(location, "Theta/Alpha (EC)", ta, "1.2-1.6", status, probe, "Theta_EC / Alpha_EC"))
 
-        status = _status_for_lt(total, 60.0)
+        status = total_statuses[i]
         out.append(
             _as_metric(
                 location,
@@ -562,28 +673,30 @@ def _analyze_frontal_pair(f3: Dict[str, float], f4: Dict[str, float]) -> List[Me
                 "< 60 uV",
                 status,
                 "Ask about developmental delays, autism-spectrum behavior, and memory/cognitive deficits."
-                if status == "OUT_OF_RANGE"
+                if status is STATUS_OUT_OF_RANGE
                 else "",
                 "Theta_EC + Alpha_EC + Beta_EC",
             )
         )
 
-    for band in ("theta", "alpha", "beta"):
-        f3v = f3.get(band, float("nan"))
-        f4v = f4.get(band, float("nan"))
-        mean_v = np.nanmean([f3v, f4v])
-        signed = float("nan") if mean_v == 0 or math.isnan(mean_v) else (f4v - f3v) / mean_v * 100.0
-        abs_diff = float("nan") if math.isnan(signed) else abs(signed)
-        status = "MISSING" if math.isnan(abs_diff) else ("IN_RANGE" if abs_diff <= 15.0 else "OUT_OF_RANGE")
+    bands = ("theta", "alpha", "beta")
+    v3 = np.array([f3.get(band, math.nan) for band in bands], dtype=np.float64)
+    v4 = np.array([f4.get(band, math.nan) for band in bands], dtype=np.float64)
+    mean_v = (v3 + v4) / 2.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        signed = np.where((mean_v == 0) | np.isnan(mean_v), math.nan, (v4 - v3) / mean_v * 100.0)
+    asym_statuses = _statuses(np.abs(signed), "le", 15.0)
+
+    for band, f3v, f4v, signed_v, status in zip(bands, v3.tolist(), v4.tolist(), signed.tolist(), asym_statuses):
         out.append(
             _as_metric(
                 "F3/F4",
                 f"{band.title()} asymmetry %",
-                signed,
+                signed_v,
                 "abs(diff) <= 15% (parity check)",
                 status,
                 "Frontal asymmetry exceeds expected parity; correlate with executive/emotional regulation history."
-                if status == "OUT_OF_RANGE"
+                if status is STATUS_OUT_OF_RANGE
                 else "",
                 f"(F4_{band} - F3_{band}) / mean(F3_{band}, F4_{band}) * 100 (status uses abs)",
                 left_value=f3v,
@@ -597,11 +710,11 @@ def _analyze_frontal_pair(f3: Dict[str, float], f4: Dict[str, float]) -> List[Me
 def _analyze_fz(fz: Dict[str, float]) -> List[MetricResult]:
     out: List[MetricResult] = []
 
-    delta = fz.get("delta", float("nan"))
+    delta = fz.get("delta", math.nan)
     hibeta_beta = _safe_div(fz.get("hibeta", 0.0), fz.get("beta", 0.0))
-    hibeta_plus_beta = fz.get("hibeta_plus_beta", float("nan"))
+    hibeta_plus_beta = fz.get("hibeta_plus_beta", math.nan)
     lo_hi_alpha = _safe_div(fz.get("lo_alpha", 0.0), fz.get("hi_alpha", 0.0))
-    peak_alpha = fz.get("peak_alpha", float("nan"))
+    peak_alpha = fz.get("peak_alpha", math.nan)
 
     status = _status_for_lt(delta, 9.0)
     out.append(
@@ -612,7 +725,7 @@ def _analyze_fz(fz: Dict[str, float]) -> List[MetricResult]:
             "< 9.0 uV",
             status,
             "Ask about concentration, forgetfulness, comprehension deficits; consider developmental delay or pain context with F3/F4 findings."
-            if status == "OUT_OF_RANGE"
+            if status is STATUS_OUT_OF_RANGE
             else "",
             "Delta_EC",
         )
@@ -620,7 +733,7 @@ def _analyze_fz(fz: Dict[str, float]) -> List[MetricResult]:
 
     status = _status_for_between(hibeta_beta, 0.45, 0.55)
     probe = ""
-    if status == "OUT_OF_RANGE":
+    if status is STATUS_OUT_OF_RANGE:
         if hibeta_beta < 0.35:
             probe = "Very low ratio: problematic passivity profile."
         elif hibeta_beta < 0.45:
@@ -635,7 +748,7 @@ def _analyze_fz(fz: Dict[str, float]) -> List[MetricResult]:
 
     status = _status_for_lt(hibeta_plus_beta, 15.0)
     probe = ""
-    if status == "OUT_OF_RANGE":
+    if status is STATUS_OUT_OF_RANGE:
         if 0.45 <= hibeta_beta <= 0.55:
             probe = "If sum >15 with normal ratio, ask about fretting and treat as hot midline."
         else:
@@ -644,7 +757,7 @@ def _analyze_fz(fz: Dict[str, float]) -> List[MetricResult]:
 
     status = _status_for_lt(lo_hi_alpha, 1.5)
     probe = ""
-    if status == "OUT_OF_RANGE":
+    if status is STATUS_OUT_OF_RANGE:
         probe = "Ask about cognitive inefficiency, age-related memory/cognitive slowing, sleep issues, concentration, and forgetfulness."
         if lo_hi_alpha > 2.2:
             probe = _probe_join(probe, "Markedly high ratio: probe developmental delay and significant cognitive deficits.")
@@ -658,7 +771,7 @@ def _analyze_fz(fz: Dict[str, float]) -> List[MetricResult]:
             peak_alpha,
             "> 9.5 Hz",
             status,
-            "Ask about mental sluggishness." if status == "OUT_OF_RANGE" else "",
+            "Ask about mental sluggishness." if status is STATUS_OUT_OF_RANGE else "",
             "Peak frequency of Alpha_EC",
         )
     )
@@ -667,13 +780,16 @@ def _analyze_fz(fz: Dict[str, float]) -> List[MetricResult]:
 
 
 def analyze_session(session_data: Dict[str, Any]) -> SessionResult:
-    epochs = list(session_data.get("epochs", []))
+    table = session_data.get("feature_table")
+    if table is None:
+        table = build_feature_table(session_data.get("epochs", []))
+    lookup = _index_epochs(table)
 
-    cz = _resolve_cz_conditions(epochs)
-    o1 = _resolve_o1_conditions(epochs)
-    f3 = _resolve_front_ec(epochs, "F3")
-    f4 = _resolve_front_ec(epochs, "F4")
-    fz = _resolve_front_ec(epochs, "Fz")
+    cz = _resolve_cz_conditions(lookup)
+    o1 = _resolve_o1_conditions(lookup)
+    f3 = _resolve_front_ec(lookup, "F3")
+    f4 = _resolve_front_ec(lookup, "F4")
+    fz = _resolve_front_ec(lookup, "Fz")
 
     metrics: List[MetricResult] = []
     metrics.extend(_analyze_cz(cz))
@@ -681,20 +797,20 @@ def analyze_session(session_data: Dict[str, Any]) -> SessionResult:
     metrics.extend(_analyze_frontal_pair(f3, f4))
     metrics.extend(_analyze_fz(fz))
 
-    in_range = sum(1 for m in metrics if m.status == "IN_RANGE")
-    out_of_range = sum(1 for m in metrics if m.status == "OUT_OF_RANGE")
-    missing = sum(1 for m in metrics if m.status == "MISSING")
-
+    in_range = out_of_range = missing = 0
     probe_questions: List[str] = []
     seen = set()
     for metric in metrics:
-        if metric.status != "OUT_OF_RANGE":
-            continue
-        if not metric.probe:
-            continue
-        if metric.probe not in seen:
-            seen.add(metric.probe)
-            probe_questions.append(metric.probe)
+        status = metric.status
+        if status is STATUS_IN_RANGE:
+            in_range += 1
+        elif status is STATUS_MISSING:
+            missing += 1
+        elif status is STATUS_OUT_OF_RANGE:
+            out_of_range += 1
+            if metric.probe and metric.probe not in seen:
+                seen.add(metric.probe)
+                probe_questions.append(metric.probe)
 
     summary = {
         "in_range": in_range,
@@ -723,10 +839,25 @@ def analyze_session(session_data: Dict[str, Any]) -> SessionResult:
     return SessionResult(metadata=metadata, metrics=metrics, summary=summary, derived=derived)
 
 
+def analyze_sessions(
+    sessions: Iterable[Dict[str, Any]],
+    *,
+    max_workers: int | None = None,
+    chunksize: int = 8,
+) -> List[SessionResult]:
+    """Analyze many sessions across worker processes, preserving input order."""
+    items = list(sessions)
+    workers = min(max_workers or os.cpu_count() or 1, len(items))
+    if workers <= 1:
+        return [analyze_session(item) for item in items]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(analyze_session, items, chunksize=max(1, chunksize)))
+
+
 def session_result_to_dict(result: SessionResult) -> Dict[str, Any]:
     return {
         "metadata": result.metadata,
-        "metrics": [asdict(m) for m in result.metrics],
+        "metrics": [metric_to_dict(m) for m in result.metrics],
         "summary": result.summary,
         "derived": result.derived,
     }
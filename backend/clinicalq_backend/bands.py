@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from typing import Dict, Tuple
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 import numpy as np
 
+from clinicalq_backend.types import BAND_KEYS
+
 BANDS: Dict[str, Tuple[float, float]] = {
     "delta": (1.5, 2.5),
     "theta": (3.0, 7.0),
@@ -15,54 +18,134 @@ BANDS: Dict[str, Tuple[float, float]] = {
     "hibeta": (28.0, 40.0),
 }
 
+_THETA, _ALPHA, _BETA, _HIBETA = (list(BANDS).index(name) for name in ("theta", "alpha", "beta", "hibeta"))
+_BAND_LOWS = np.array([low for low, _ in BANDS.values()], dtype=float)
+_BAND_HIGHS = np.array([high for _, high in BANDS.values()], dtype=float)
+
 
 def _safe_signal(signal: np.ndarray) -> np.ndarray:
-    x = np.asarray(signal, dtype=float)
-    if x.size < 4:
-        return np.zeros(4, dtype=float)
+    x = np.asarray(signal, dtype=np.float32)
+    if x.ndim == 0 or x.shape[-1] < 4:
+        return np.zeros(x.shape[:-1] + (4,), dtype=np.float32)
     if np.any(np.isnan(x)):
         x = np.nan_to_num(x, nan=0.0)
     return x
 
 
-def _amplitude_spectrum(signal: np.ndarray, sampling_rate: int) -> tuple[np.ndarray, np.ndarray]:
-    x = _safe_signal(signal)
-    x = x - np.mean(x)
-    n = x.size
+@lru_cache(maxsize=32)
+def _window_cache(n: int) -> tuple[np.ndarray, float]:
     window = np.hanning(n)
-    windowed = x * window
-    spectrum = np.fft.rfft(windowed)
-    scale = 2.0 / np.sum(window)
-    amps = np.abs(spectrum) * scale
+    scale = 2.0 / float(np.sum(window))
+    window = window.astype(np.float32)
+    window.setflags(write=False)
+    return window, scale
+
+
+@lru_cache(maxsize=32)
+def _freqs_cache(n: int, sampling_rate: int) -> np.ndarray:
     freqs = np.fft.rfftfreq(n, d=1.0 / float(sampling_rate))
+    freqs.setflags(write=False)
+    return freqs
+
+
+def _amplitude_spectrum(signal: np.ndarray, sampling_rate: int) -> tuple[np.ndarray, np.ndarray]:
+    x = _safe_signal(signal)
+    n = x.shape[-1]
+    window, scale = _window_cache(n)
+    # Demean and window in one scratch buffer; never writes into the caller's array.
+    windowed = np.empty_like(x)
+    np.subtract(x, np.mean(x, axis=-1, keepdims=True), out=windowed)
+    freqs = _freqs_cache(n, sampling_rate)
+    if not np.any(windowed):
+        # Flat or zero-padded input has an all-zero spectrum; skip the FFT.
+        return freqs, np.zeros(x.shape[:-1] + (freqs.size,), dtype=np.float32)
+    np.multiply(windowed, window, out=windowed)
+    spectrum = np.fft.rfft(windowed, axis=-1)
+    amps = np.abs(spectrum)
+    amps *= scale
     return freqs, amps
 
 
-def band_amplitude(signal: np.ndarray, sampling_rate: int, low_hz: float, high_hz: float) -> float:
-    freqs, amps = _amplitude_spectrum(signal, sampling_rate)
-    mask = (freqs >= low_hz) & (freqs <= high_hz)
-    if not np.any(mask):
+Spectrum = Tuple[np.ndarray, np.ndarray]
+
+
+def _band_bounds(freqs: np.ndarray, low_hz: float, high_hz: float) -> tuple[int, int]:
+    lo = int(np.searchsorted(freqs, low_hz, side="left"))
+    hi = int(np.searchsorted(freqs, high_hz, side="right"))
+    return lo, hi
+
+
+def _band_powers(amps: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Return the L2 norm of amps[..., lo[i]:hi[i]] for every band i, along the last axis."""
+    energy = np.zeros(amps.shape[:-1] + (amps.shape[-1] + 1,), dtype=np.float64)
+    np.cumsum(np.square(amps, dtype=np.float64), axis=-1, out=energy[..., 1:])
+    return np.sqrt(energy[..., hi] - energy[..., lo])
+
+
+def band_amplitude(
+    signal: np.ndarray,
+    sampling_rate: int,
+    low_hz: float,
+    high_hz: float,
+    spectrum: Spectrum | None = None,
+) -> float:
+    freqs, amps = spectrum if spectrum is not None else _amplitude_spectrum(signal, sampling_rate)
+    lo, hi = _band_bounds(freqs, low_hz, high_hz)
+    if hi <= lo:
         return 0.0
-    return float(np.sqrt(np.sum(np.square(amps[mask]))))
+    return float(np.linalg.norm(amps[lo:hi]))
 
 
-def peak_alpha_frequency(signal: np.ndarray, sampling_rate: int) -> float:
-    freqs, amps = _amplitude_spectrum(signal, sampling_rate)
-    mask = (freqs >= 8.0) & (freqs <= 12.0)
-    if not np.any(mask):
+def peak_alpha_frequency(signal: np.ndarray, sampling_rate: int, spectrum: Spectrum | None = None) -> float:
+    freqs, amps = spectrum if spectrum is not None else _amplitude_spectrum(signal, sampling_rate)
+    lo, hi = _band_bounds(freqs, 8.0, 12.0)
+    if hi <= lo:
         return 0.0
-    band_freqs = freqs[mask]
-    band_amps = amps[mask]
-    peak_idx = int(np.argmax(band_amps))
-    return float(band_freqs[peak_idx])
+    return float(freqs[lo + int(np.argmax(amps[lo:hi]))])
 
 
 def extract_features(signal: np.ndarray, sampling_rate: int) -> Dict[str, float]:
-    features: Dict[str, float] = {}
-    for band, (low, high) in BANDS.items():
-        features[band] = band_amplitude(signal, sampling_rate, low, high)
-    features["total_amp_basic"] = features["theta"] + features["alpha"] + features["beta"]
-    features["hibeta_plus_beta"] = features["hibeta"] + features["beta"]
-    features["peak_alpha"] = peak_alpha_frequency(signal, sampling_rate)
-    return features
+    x = np.atleast_1d(np.asarray(signal, dtype=np.float32))
+    return extract_features_batch(x[None, :], sampling_rate)[0]
+
+
+def extract_features_batch(signals: np.ndarray, sampling_rate: int) -> List[Dict[str, float]]:
+    """Extract features for equal-length signals stacked as rows of a 2-D array."""
+    table = extract_feature_array(signals, sampling_rate)
+    return [dict(zip(BAND_KEYS, row)) for row in table.tolist()]
+
+
+def extract_feature_array(
+    signals: np.ndarray,
+    sampling_rate: int,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Like extract_features_batch, as an (n_signals, len(BAND_KEYS)) float64 array.
+
+    ``out``, if given, must be a float64 array of that shape and is filled and returned.
+    """
+    x = np.asarray(signals, dtype=np.float32)
+    if x.ndim != 2:
+        raise ValueError(f"Expected a 2-D (n_signals, n_samples) array, got shape {x.shape}")
+    shape = (x.shape[0], len(BAND_KEYS))
+    if out is not None and (out.shape != shape or out.dtype != np.float64):
+        raise ValueError(f"Expected a float64 output array of shape {shape}, got {out.dtype} {out.shape}")
+
+    freqs, amps = _amplitude_spectrum(x, sampling_rate)
+    lo = np.searchsorted(freqs, _BAND_LOWS, side="left")
+    hi = np.searchsorted(freqs, _BAND_HIGHS, side="right")
+    powers = _band_powers(amps, lo, hi)
+
+    lo, hi = _band_bounds(freqs, 8.0, 12.0)
+    if hi <= lo:
+        peak_alpha = np.zeros(x.shape[0], dtype=float)
+    else:
+        peak_alpha = freqs[lo + np.argmax(amps[:, lo:hi], axis=-1)]
 
+    n_bands = len(BANDS)
+    table = np.empty(shape, dtype=np.float64) if out is None else out
+    table[:, :n_bands] = powers
+    table[:, n_bands] = powers[:, _THETA] + powers[:, _ALPHA] + powers[:, _BETA]
+    table[:, n_bands + 1] = powers[:, _HIBETA] + powers[:, _BETA]
+    table[:, n_bands + 2] = peak_alpha
+    return table
@@ -9,6 +9,40 @@ import numpy as np
 
 TickCallback = Callable[[int], None]
 
+# Simulated rhythms in _condition_gains order (theta, alpha, beta, hibeta, delta):
+# frequency in Hz and per-channel phase offset in radians per channel number.
+_SIM_FREQS = np.array([5.2, 10.1, 20.4, 33.0, 2.0])
+_SIM_PHASES = np.array([0.31, 0.22, 0.47, 0.61, 0.09])
+_SIM_TWO_PI_F = (2.0 * math.pi * _SIM_FREQS)[:, None, None]
+
+
+def _build_condition_gains(label: str) -> tuple[float, float, float, float, float]:
+    ec_like = label in {"EC", "FRONTAL_EC"}
+    alpha_gain = 8.0 if ec_like else 4.5
+    theta_gain = 5.0
+    beta_gain = 3.4
+    hibeta_gain = 1.4
+    delta_gain = 0.8
+
+    if label in {"READ", "COUNT"}:
+        theta_gain += 1.3
+        beta_gain -= 0.7
+    if label == "OMNI":
+        theta_gain -= 0.8
+    if label in {"TEST", "HARMONIC"}:
+        alpha_gain += 0.6
+        beta_gain += 0.3
+
+    return theta_gain, alpha_gain, beta_gain, hibeta_gain, delta_gain
+
+
+# Condition gains are fixed per label, so build the table once at import.
+_GAINS = {
+    label: _build_condition_gains(label)
+    for label in ("EO", "EC", "FRONTAL_EC", "READ", "COUNT", "OMNI", "TEST", "HARMONIC")
+}
+_DEFAULT_GAINS = _build_condition_gains("EO")
+
 
 @dataclass(slots=True)
 class BoardRuntimeConfig:
@@ -42,13 +76,28 @@ class BoardBase:
     ) -> Dict[int, np.ndarray]:
         raise NotImplementedError
 
+    def read_epoch_array(
+        self,
+        seconds: int,
+        label: str,
+        on_tick: TickCallback | None = None,
+    ) -> np.ndarray:
+        """Like read_epoch, as an (n_channels, n_samples) array with rows in eeg_channels order."""
+        data = self.read_epoch(seconds, label, on_tick=on_tick)
+        return np.stack([np.asarray(data[ch], dtype=float) for ch in self.eeg_channels])
+
 
 class SimulatedBoard(BoardBase):
     def __init__(self, runtime: BoardRuntimeConfig, channels: Iterable[int], seed: int = 42):
         super().__init__(runtime)
-        self._rng = np.random.default_rng(seed)
+        # Simulation noise does not need PCG64's guarantees; SFC64 draws faster.
+        self._rng = np.random.Generator(np.random.SFC64(seed))
         self._sample_cursor = 0
+        self._scratch = np.empty(0, dtype=float)
         self.eeg_channels = sorted(set(int(ch) for ch in channels))
+        ch = np.asarray(self.eeg_channels, dtype=float)[:, None]
+        self._phase_offsets = _SIM_PHASES[:, None, None] * ch[None]
+        self._ch_factor = 1.0 + (ch % 5) * 0.04
 
     def start(self) -> None:
         return
@@ -57,37 +106,39 @@ class SimulatedBoard(BoardBase):
         return
 
     def _condition_gains(self, label: str) -> tuple[float, float, float, float, float]:
-        ec_like = label in {"EC", "FRONTAL_EC"}
-        alpha_gain = 8.0 if ec_like else 4.5
-        theta_gain = 5.0
-        beta_gain = 3.4
-        hibeta_gain = 1.4
-        delta_gain = 0.8
-
-        if label in {"READ", "COUNT"}:
-            theta_gain += 1.3
-            beta_gain -= 0.7
-        if label == "OMNI":
-            theta_gain -= 0.8
-        if label in {"TEST", "HARMONIC"}:
-            alpha_gain += 0.6
-            beta_gain += 0.3
-
-        return theta_gain, alpha_gain, beta_gain, hibeta_gain, delta_gain
-
-    def _generate_channel(self, channel: int, n_samples: int, label: str) -> np.ndarray:
-        idx = np.arange(n_samples, dtype=float) + self._sample_cursor
-        t = idx / float(self.sampling_rate)
-        theta_g, alpha_g, beta_g, hibeta_g, delta_g = self._condition_gains(label)
-
-        ch_factor = 1.0 + (channel % 5) * 0.04
-        theta = theta_g * np.sin(2.0 * math.pi * 5.2 * t + channel * 0.31)
-        alpha = alpha_g * np.sin(2.0 * math.pi * 10.1 * t + channel * 0.22)
-        beta = beta_g * np.sin(2.0 * math.pi * 20.4 * t + channel * 0.47)
-        hibeta = hibeta_g * np.sin(2.0 * math.pi * 33.0 * t + channel * 0.61)
-        delta = delta_g * np.sin(2.0 * math.pi * 2.0 * t + channel * 0.09)
-        noise = self._rng.normal(0.0, 0.9, size=n_samples)
-        return ch_factor * (theta + alpha + beta + hibeta + delta + noise)
+        return _GAINS.get(label, _DEFAULT_GAINS)
+
+    def _draw_noise(self, n_samples: int) -> np.ndarray:
+        # One draw for every channel, scaled in place.
+        noise = self._rng.standard_normal((len(self.eeg_channels), n_samples))
+        noise *= 0.9
+        return noise
+
+    def _generate_all(self, n_samples: int, label: str, noise: np.ndarray) -> np.ndarray:
+        """Synthesize every EEG channel at once as an (n_channels, n_samples) array.
+
+        ``noise`` comes from _draw_noise and is used as the output buffer.
+        """
+        t = (np.arange(n_samples, dtype=float) + self._sample_cursor) / float(self.sampling_rate)
+        gains = np.asarray(self._condition_gains(label), dtype=float)
+
+        # All five rhythms share one phase buffer and one np.sin call, then a
+        # single gain-weighted reduction sums them per channel.
+        shape = (_SIM_FREQS.size, len(self.eeg_channels), n_samples)
+        size = shape[0] * shape[1] * shape[2]
+        if self._scratch.size < size:
+            self._scratch = np.empty(size, dtype=float)
+        phase = self._scratch[:size].reshape(shape)
+        np.multiply(_SIM_TWO_PI_F, t, out=phase)
+        phase += self._phase_offsets
+        np.sin(phase, out=phase)
+        out = noise
+        out += np.tensordot(gains, phase, axes=1)
+        out *= self._ch_factor
+        return out
+
+    def _split_channels(self, block: np.ndarray) -> Dict[int, np.ndarray]:
+        return {ch: block[i] for i, ch in enumerate(self.eeg_channels)}
 
     def read_epoch(
         self,
@@ -95,34 +146,40 @@ class SimulatedBoard(BoardBase):
         label: str,
         on_tick: TickCallback | None = None,
     ) -> Dict[int, np.ndarray]:
+        return self._split_channels(self.read_epoch_array(seconds, label, on_tick=on_tick))
+
+    def read_epoch_array(
+        self,
+        seconds: int,
+        label: str,
+        on_tick: TickCallback | None = None,
+    ) -> np.ndarray:
         if seconds <= 0:
             seconds = 1
 
         if not self.runtime.fast_mode:
+            t0 = time.monotonic()
             for sec in range(seconds):
-                time.sleep(1.0)
+                time.sleep(max(0.0, t0 + sec + 1 - time.monotonic()))
                 if on_tick:
                     on_tick(seconds - sec - 1)
         elif on_tick:
             on_tick(0)
 
         n_samples = int(seconds * self.sampling_rate)
-        data: Dict[int, np.ndarray] = {}
-        for ch in self.eeg_channels:
-            data[ch] = self._generate_channel(ch, n_samples, label)
-
+        noise = self._draw_noise(n_samples)
+        block = self._generate_all(n_samples, label, noise)
         self._sample_cursor += n_samples
-        return data
+        return block
 
     def read_chunk(self, n_samples: int, label: str) -> Dict[int, np.ndarray]:
         if n_samples <= 0:
             return {}
 
-        data: Dict[int, np.ndarray] = {}
-        for ch in self.eeg_channels:
-            data[ch] = self._generate_channel(ch, int(n_samples), label)
-
-        self._sample_cursor += int(n_samples)
+        n_samples = int(n_samples)
+        noise = self._draw_noise(n_samples)
+        data = self._split_channels(self._generate_all(n_samples, label, noise))
+        self._sample_cursor += n_samples
         return data
 
 
@@ -208,11 +265,21 @@ class BrainFlowBoard(BoardBase):
         label: str,
         on_tick: TickCallback | None = None,
     ) -> Dict[int, np.ndarray]:
+        rows = self.read_epoch_array(seconds, label, on_tick=on_tick)
+        return {ch: rows[i] for i, ch in enumerate(self.eeg_channels)}
+
+    def read_epoch_array(
+        self,
+        seconds: int,
+        label: str,
+        on_tick: TickCallback | None = None,
+    ) -> np.ndarray:
         if seconds <= 0:
             seconds = 1
 
+        t0 = time.monotonic()
         for sec in range(seconds):
-            time.sleep(1.0)
+            time.sleep(max(0.0, t0 + sec + 1 - time.monotonic()))
             if on_tick:
                 on_tick(seconds - sec - 1)
 
@@ -221,16 +288,16 @@ class BrainFlowBoard(BoardBase):
         if data.size == 0:
             data = self.board.get_current_board_data(n_samples)
 
-        out: Dict[int, np.ndarray] = {}
-        for ch in self.eeg_channels:
-            sig = np.asarray(data[ch], dtype=float)
-            if sig.size >= n_samples:
-                out[ch] = sig[-n_samples:]
-            elif sig.size > 0:
-                out[ch] = np.pad(sig, (n_samples - sig.size, 0), mode="edge")
-            else:
-                out[ch] = np.zeros(n_samples, dtype=float)
-        return out
+        # One cast of the EEG rows, then hand out per-channel views.
+        rows = np.asarray(data, dtype=np.float64)[self.eeg_channels]
+        total = rows.shape[1]
+        if total >= n_samples:
+            rows = rows[:, total - n_samples :]
+        elif total > 0:
+            rows = np.pad(rows, ((0, 0), (n_samples - total, 0)), mode="edge")
+        else:
+            rows = np.zeros((len(self.eeg_channels), n_samples), dtype=float)
+        return rows
 
     def read_chunk(self, n_samples: int, label: str) -> Dict[int, np.ndarray]:
         data = self.board.get_board_data()
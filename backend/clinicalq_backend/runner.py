@@ -1,65 +1,109 @@
 from __future__ import annotations
 
-import copy
 import json
+import os
+import queue
+import selectors
 import sys
+import threading
 import time
-from dataclasses import asdict
-from typing import Any, Dict, Iterable, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping
 
 import numpy as np
 
 from clinicalq_backend.analysis import analyze_session, session_result_to_dict
-from clinicalq_backend.bands import extract_features
+from clinicalq_backend.bands import extract_feature_array, extract_features_batch
 from clinicalq_backend.openbci import create_board
 from clinicalq_backend.protocol import CZ_SEQUENCE, EC_SINGLE_SEQUENCE, O1_SEQUENCE, SEQUENTIAL_ORDER, SIMULTANEOUS_EXTRA
-from clinicalq_backend.types import EpochCapture, EpochSpec, EventCallback
+from clinicalq_backend.types import BAND_KEYS, EpochCapture, EpochSpec, EventCallback, SessionFeatureTable
 
-DEFAULT_CHANNELS = {"Cz": 1, "O1": 2, "Fz": 3, "F3": 4, "F4": 5}
+# Read-only so _resolve_channels can hand it out without copying.
+DEFAULT_CHANNELS: Mapping[str, int] = MappingProxyType({"Cz": 1, "O1": 2, "Fz": 3, "F3": 4, "F4": 5})
 REQUIRED_LOCATIONS = ["O1", "Cz", "Fz", "F3", "F4"]
+READY_POLL_SECONDS = 1.0
 
 
-def _emit(event_cb: EventCallback | None, event: str, **payload: Any) -> None:
-    if not event_cb:
-        return
+def _emit(event_cb: EventCallback, event: str, **payload: Any) -> None:
     event_cb({"event": event, **payload})
 
 
-def _resolve_channels(config: Dict[str, Any]) -> Dict[str, int]:
-    merged = dict(DEFAULT_CHANNELS)
-    merged.update({k: int(v) for k, v in config.get("channels", {}).items()})
-    return merged
+def _emit_noop(event: str, **payload: Any) -> None:
+    return
 
 
-def _validate_required_channels(channels: Dict[str, int]) -> None:
-    missing = [loc for loc in REQUIRED_LOCATIONS if loc not in channels]
-    if missing:
-        raise RuntimeError(f"Missing required channel mappings: {', '.join(missing)}")
+# An event callback bound by _bind_emit: called as emit(event_name, **payload).
+Emit = Callable[..., None]
 
-    invalid = [loc for loc in REQUIRED_LOCATIONS if int(channels.get(loc, 0)) <= 0]
-    if invalid:
-        raise RuntimeError(f"Invalid channel index (must be >= 1) for: {', '.join(invalid)}")
 
-    seen: Dict[int, str] = {}
+def _bind_emit(event_cb: EventCallback | None) -> Emit:
+    """Bind the callback once; headless runs get a no-op and never build event payloads."""
+    return partial(_emit, event_cb) if event_cb is not None else _emit_noop
+
+
+def _resolve_channels(config: Dict[str, Any]) -> Mapping[str, int]:
+    overrides = config.get("channels")
+    if not overrides:
+        return DEFAULT_CHANNELS
+    return {**DEFAULT_CHANNELS, **{k: int(v) for k, v in overrides.items()}}
+
+
+def _validate_required_channels(channels: Mapping[str, int]) -> None:
+    missing: List[str] = []
+    invalid: List[str] = []
     duplicates: List[str] = []
+    seen: Dict[int, str] = {}
     for loc in REQUIRED_LOCATIONS:
-        ch = int(channels[loc])
-        if ch in seen:
+        ch = channels.get(loc)
+        if ch is None:
+            missing.append(loc)
+            continue
+        ch = int(ch)
+        if ch <= 0:
+            invalid.append(loc)
+        elif ch in seen:
             duplicates.append(f"{seen[ch]} and {loc} both map to channel {ch}")
         else:
             seen[ch] = loc
+
+    if missing:
+        raise RuntimeError(f"Missing required channel mappings: {', '.join(missing)}")
+    if invalid:
+        raise RuntimeError(f"Invalid channel index (must be >= 1) for: {', '.join(invalid)}")
     if duplicates:
         raise RuntimeError("Duplicate channel mappings are not allowed: " + "; ".join(duplicates))
 
 
-def _resolve_sequence(location: str) -> List[EpochSpec]:
-    if location == "Cz":
-        return copy.deepcopy(CZ_SEQUENCE)
-    if location == "O1":
-        return copy.deepcopy(O1_SEQUENCE)
-    if location in {"Fz", "F3", "F4"}:
-        return copy.deepcopy(EC_SINGLE_SEQUENCE)
-    raise ValueError(f"Unsupported location: {location}")
+# Immutable templates; EpochSpec is frozen, so these can be handed out as-is.
+_LOCATION_SEQUENCES: Dict[str, tuple[EpochSpec, ...]] = {
+    "Cz": tuple(CZ_SEQUENCE),
+    "O1": tuple(O1_SEQUENCE),
+    "Fz": tuple(EC_SINGLE_SEQUENCE),
+    "F3": tuple(EC_SINGLE_SEQUENCE),
+    "F4": tuple(EC_SINGLE_SEQUENCE),
+}
+
+
+@lru_cache(maxsize=32)
+def _sequence_for(location: str, epoch_seconds: int) -> tuple[EpochSpec, ...]:
+    template = _LOCATION_SEQUENCES.get(location)
+    if template is None:
+        raise ValueError(f"Unsupported location: {location}")
+    if all(spec.seconds == epoch_seconds for spec in template):
+        return template
+    return tuple(_apply_epoch_seconds(template, epoch_seconds))
+
+
+@lru_cache(maxsize=8)
+def _simultaneous_sequence(epoch_seconds: int, include_frontal_baseline: bool) -> tuple[EpochSpec, ...]:
+    template = tuple(CZ_SEQUENCE)
+    if include_frontal_baseline:
+        template += tuple(SIMULTANEOUS_EXTRA)
+    if all(spec.seconds == epoch_seconds for spec in template):
+        return template
+    return tuple(_apply_epoch_seconds(template, epoch_seconds))
 
 
 def _apply_epoch_seconds(sequence: Iterable[EpochSpec], epoch_seconds: int) -> List[EpochSpec]:
@@ -69,19 +113,50 @@ def _apply_epoch_seconds(sequence: Iterable[EpochSpec], epoch_seconds: int) -> L
     ]
 
 
+def _features_by_location(signals: Dict[str, np.ndarray], sampling_rate: int) -> Dict[str, Dict[str, float]]:
+    """Extract features for each location, batching equal-length signals into one FFT."""
+    by_length: Dict[int, List[str]] = {}
+    for location, sig in signals.items():
+        by_length.setdefault(int(sig.shape[-1]), []).append(location)
+
+    extracted: Dict[str, Dict[str, float]] = {}
+    for locations in by_length.values():
+        stacked = np.stack([signals[location] for location in locations])
+        extracted.update(zip(locations, extract_features_batch(stacked, sampling_rate)))
+    return {location: extracted[location] for location in signals}
+
+
+def _fill_epoch_row(dest: np.ndarray, sig: np.ndarray) -> np.ndarray:
+    n = min(sig.size, dest.size)
+    dest[:n] = sig[:n]
+    # Short reads are edge-padded; a channel that delivered nothing reads as flat zeros.
+    dest[n:] = sig[n - 1] if n else 0.0
+    return dest
+
+
 def _capture_epoch(
     board,
-    channels: Dict[str, int],
+    channels: Mapping[str, int],
     sequence_name: str,
     spec: EpochSpec,
     active_locations: List[str],
-    event_cb: EventCallback | None,
+    emit: Emit,
     *,
     fast_mode: bool,
     live_bandpower: bool,
     live_window_seconds: float,
+    live_hop_seconds: float | None = None,
     next_spec: EpochSpec | None,
+    out: np.ndarray | None = None,
+    sorted_locations: tuple[str, ...] | None = None,
 ) -> EpochCapture:
+    """Acquire one epoch and return its raw samples per location.
+
+    ``out`` is an optional (n_locations, n_samples) float32 buffer the epoch is
+    written into; raw samples are row views of it. Block reads that are not
+    exactly n_samples long keep their own length instead. ``sorted_locations`` is
+    active_locations pre-sorted by the caller for the epoch_complete event.
+    """
     next_epoch = None
     if next_spec is not None:
         next_epoch = {
@@ -92,8 +167,7 @@ def _capture_epoch(
             "seconds": int(next_spec.seconds),
         }
 
-    _emit(
-        event_cb,
+    emit(
         "epoch_start",
         sequence=sequence_name,
         index=spec.index,
@@ -105,8 +179,7 @@ def _capture_epoch(
     )
 
     def _emit_tick(seconds_remaining: int) -> None:
-        _emit(
-            event_cb,
+        emit(
             "epoch_tick",
             sequence=sequence_name,
             index=spec.index,
@@ -114,84 +187,118 @@ def _capture_epoch(
             seconds_remaining=seconds_remaining,
         )
 
-    epoch_data: Dict[int, np.ndarray]
-    needed_channels = {int(channels[loc]) for loc in active_locations}
-    buffers: Dict[int, List[np.ndarray]] = {ch: [] for ch in needed_channels}
+    loc_channels = [(loc, int(channels[loc])) for loc in active_locations]
+    needed_channels = tuple(dict.fromkeys(ch for _, ch in loc_channels))
     target_samples = int(spec.seconds * board.sampling_rate)
+    if out is None:
+        out = np.empty((len(loc_channels), target_samples), dtype=np.float32)
+    raw: Dict[str, np.ndarray] = {}
+    # Per-channel epoch buffer filled up to write_idx; the live window is its tail.
+    ring: Dict[int, np.ndarray] = {ch: np.empty(target_samples, dtype=float) for ch in needed_channels}
+    write_idx: Dict[int, int] = {ch: 0 for ch in needed_channels}
 
     can_stream = live_bandpower and hasattr(board, "flush") and hasattr(board, "read_chunk")
     if can_stream:
         board.flush()
         window_samples = max(1, int(live_window_seconds * board.sampling_rate))
-
+        if live_hop_seconds is None:
+            live_hop_seconds = live_window_seconds / 2.0
+        # The hop is counted in one-second ticks, since real boards deliver a sample
+        # or two more or less than sampling_rate per read.
+        hop_ticks = max(1, round(live_hop_seconds))
+        live_features: Dict[str, Dict[str, float]] = {}
+        live_feature_tick: Dict[str, int] = {}
+
+        t0 = time.monotonic()
         for sec in range(spec.seconds):
             if not fast_mode:
-                time.sleep(1.0)
+                # Sleep to the next whole-second deadline so tick work does not accumulate as drift.
+                time.sleep(max(0.0, t0 + sec + 1 - time.monotonic()))
             seconds_remaining = spec.seconds - sec - 1
 
             chunk = board.read_chunk(int(board.sampling_rate), spec.label) or {}
             for ch in needed_channels:
                 sig = chunk.get(ch)
-                if sig is None or np.asarray(sig).size == 0:
+                if sig is None:
+                    continue
+                sig = np.asarray(sig, dtype=float)
+                if sig.size == 0:
                     continue
-                buffers[ch].append(np.asarray(sig, dtype=float))
+                start = write_idx[ch]
+                end = start + sig.size
+                if end > ring[ch].size:
+                    # Real boards can deliver more than the nominal epoch length; grow rather than drop.
+                    grown = np.empty(max(end, 2 * ring[ch].size), dtype=float)
+                    grown[:start] = ring[ch][:start]
+                    ring[ch] = grown
+                ring[ch][start:end] = sig
+                write_idx[ch] = end
 
             _emit_tick(seconds_remaining)
 
-            live_features: Dict[str, Dict[str, float]] = {}
-            for loc in active_locations:
-                ch = int(channels[loc])
-                if not buffers.get(ch):
-                    continue
-                sig = np.concatenate(buffers[ch], axis=0)
-                win = sig[-window_samples:] if sig.size > window_samples else sig
-                live_features[loc] = extract_features(win, board.sampling_rate)
-
-            if live_features:
-                _emit(
-                    event_cb,
-                    "bandpower",
-                    sequence=sequence_name,
-                    index=spec.index,
-                    label=spec.label,
-                    seconds_elapsed=sec + 1,
-                    seconds_remaining=seconds_remaining,
-                    window_seconds=live_window_seconds,
-                    features=live_features,
-                )
-
-        epoch_data = {}
-        for ch in needed_channels:
-            if buffers.get(ch):
-                sig = np.concatenate(buffers[ch], axis=0)
-            else:
-                sig = np.zeros(0, dtype=float)
+            # Headless runs have nobody to show live bandpower to, so skip computing it.
+            if emit is not _emit_noop:
+                windows: Dict[str, np.ndarray] = {}
+                for loc, ch in loc_channels:
+                    end = write_idx[ch]
+                    if end == 0:
+                        continue
+                    if loc in live_features and sec - live_feature_tick[loc] < hop_ticks:
+                        continue
+                    windows[loc] = ring[ch][max(0, end - window_samples) : end]
+                    live_feature_tick[loc] = sec
+                live_features.update(_features_by_location(windows, board.sampling_rate))
+
+                if live_features:
+                    emit(
+                        "bandpower",
+                        sequence=sequence_name,
+                        index=spec.index,
+                        label=spec.label,
+                        seconds_elapsed=sec + 1,
+                        seconds_remaining=seconds_remaining,
+                        window_seconds=live_window_seconds,
+                        features=dict(live_features),
+                    )
 
-            if sig.size >= target_samples:
-                epoch_data[ch] = sig[:target_samples]
-            elif sig.size > 0:
-                epoch_data[ch] = np.pad(sig, (0, target_samples - sig.size), mode="edge")
-            else:
-                epoch_data[ch] = np.zeros(target_samples, dtype=float)
+        for row, (location, ch) in enumerate(loc_channels):
+            raw[location] = _fill_epoch_row(out[row], ring[ch][: write_idx[ch]])
 
     else:
         # Fallback: block-capture the whole epoch (no live bandpower).
-        epoch_data = board.read_epoch(spec.seconds, spec.label, on_tick=_emit_tick)
-
-    features: Dict[str, Dict[str, float]] = {}
-    for location in active_locations:
-        ch = channels[location]
-        if ch not in epoch_data:
-            continue
-        features[location] = extract_features(epoch_data[ch], board.sampling_rate)
+        on_tick = _emit_tick if emit is not _emit_noop else None
+        reader = getattr(board, "read_epoch_array", None)
+        if reader is not None:
+            block = reader(spec.seconds, spec.label, on_tick=on_tick)
+            board_rows = {ch: i for i, ch in enumerate(board.eeg_channels)}
+        else:
+            # Boards that only implement read_epoch: stack their per-channel rows.
+            epoch_data = board.read_epoch(spec.seconds, spec.label, on_tick=on_tick)
+            board_rows = {ch: i for i, ch in enumerate(epoch_data)}
+            block = [np.asarray(sig, dtype=float) for sig in epoch_data.values()]
+            if len({sig.shape[-1] for sig in block}) == 1:
+                block = np.stack(block)
+        rows = [row for row, (_, ch) in enumerate(loc_channels) if ch in board_rows]
+        active_idx = np.array([board_rows[loc_channels[row][1]] for row in rows], dtype=np.intp)
+        if isinstance(block, np.ndarray) and block.shape[-1] == target_samples:
+            # One fancy-indexed copy gathers every active channel into the epoch buffer.
+            out[rows] = block[active_idx]
+            for row in rows:
+                raw[loc_channels[row][0]] = out[row]
+        else:
+            # Block reads are analyzed at whatever length the board returned.
+            for row, board_row in zip(rows, active_idx.tolist()):
+                raw[loc_channels[row][0]] = np.asarray(block[board_row], dtype=np.float32)
 
-    _emit(
-        event_cb,
+    emit(
         "epoch_complete",
         sequence=sequence_name,
         index=spec.index,
         label=spec.label,
-        captured_locations=sorted(features.keys()),
+        # Every active location is captured unless the board lacks one of the channels.
+        captured_locations=list(sorted_locations)
+        if sorted_locations is not None and len(raw) == len(loc_channels)
+        else sorted(raw),
     )
 
     return EpochCapture(
@@ -200,29 +307,176 @@ def _capture_epoch(
         label=spec.label,
         instruction=spec.instruction,
         seconds=spec.seconds,
-        features=features,
+        raw=raw,
+    )
+
+
+def _finalize_features(captures: List[EpochCapture], sampling_rate: int) -> None:
+    """Extract features for every captured epoch at once, then release the raw samples.
+
+    Equal-length signals across all epochs and locations share one batched FFT,
+    written into a single buffer that each capture's features_arr views.
+    """
+    buffer = np.empty((sum(len(cap.raw) for cap in captures), len(BAND_KEYS)), dtype=np.float64)
+    by_length: Dict[int, List[tuple[int, np.ndarray]]] = {}
+    start = 0
+    for cap in captures:
+        cap.features_arr = buffer[start : start + len(cap.raw)]
+        for sig in cap.raw.values():
+            by_length.setdefault(int(sig.shape[-1]), []).append((start, sig))
+            start += 1
+
+    if len(by_length) == 1:
+        (entries,) = by_length.values()
+        extract_feature_array(np.stack([sig for _, sig in entries]), sampling_rate, out=buffer)
+    else:
+        for entries in by_length.values():
+            rows = [row for row, _ in entries]
+            buffer[rows] = extract_feature_array(np.stack([sig for _, sig in entries]), sampling_rate)
+
+    for cap in captures:
+        rows = cap.features_arr.tolist()
+        cap.features = {location: dict(zip(BAND_KEYS, row)) for location, row in zip(cap.raw, rows)}
+        cap.raw = {}
+
+
+def _feature_table(captures: List[EpochCapture]) -> SessionFeatureTable:
+    """Pack finalized captures into a SessionFeatureTable straight from their feature arrays."""
+    locations: Dict[str, int] = {}
+    for cap in captures:
+        for location in cap.features:
+            locations.setdefault(location, len(locations))
+
+    values = np.full((len(locations), len(BAND_KEYS), len(captures)), np.nan)
+    captured = np.zeros((len(locations), len(captures)), dtype=bool)
+    for col, cap in enumerate(captures):
+        rows = [locations[location] for location in cap.features]
+        values[rows, :, col] = cap.features_arr
+        captured[rows, col] = True
+
+    return SessionFeatureTable(
+        locations=list(locations),
+        bands=list(BAND_KEYS),
+        sequences=np.array([cap.sequence for cap in captures], dtype=object),
+        epoch_indices=np.array([cap.index for cap in captures], dtype=np.int64),
+        epoch_labels=np.array([cap.label for cap in captures], dtype=object),
+        values=values,
+        # Extracted epochs always carry every band.
+        present=np.repeat(captured[:, None, :], len(BAND_KEYS), axis=1),
+        captured=captured,
     )
 
 
-def _countdown(event_cb: EventCallback | None, event: str, seconds: int, **payload: Any) -> None:
+def _capture_to_dict(cap: EpochCapture) -> Dict[str, Any]:
+    # Shallow on purpose: asdict() would deep-copy every per-location features dict.
+    return {
+        "sequence": cap.sequence,
+        "index": cap.index,
+        "label": cap.label,
+        "instruction": cap.instruction,
+        "seconds": cap.seconds,
+        "features": cap.features,
+    }
+
+
+def _countdown(emit: Emit, event: str, seconds: int, **payload: Any) -> None:
     if seconds <= 0:
         return
-    for remaining in range(seconds, 0, -1):
-        _emit(event_cb, event, seconds_remaining=remaining, **payload)
-        time.sleep(1.0)
-
+    t0 = time.monotonic()
+    for elapsed, remaining in enumerate(range(seconds, 0, -1), start=1):
+        emit(event, seconds_remaining=remaining, **payload)
+        # Sleep to a fixed deadline so slow event callbacks do not stretch the countdown.
+        time.sleep(max(0.0, t0 + elapsed - time.monotonic()))
+
+
+class _StdinLines:
+    """Reads stdin lines with a timeout so waits can heartbeat instead of blocking."""
+
+    def __init__(self, stream) -> None:
+        self.stream = stream
+        self._eof = False
+        self._pending = b""
+        self._selector: selectors.BaseSelector | None = None
+        self._queue: queue.Queue[str] | None = None
+        try:
+            if sys.platform == "win32":  # select() only handles sockets on Windows.
+                raise OSError("stdin is not selectable on Windows")
+            self._fd = stream.fileno()
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self._fd, selectors.EVENT_READ)
+        except (OSError, ValueError):
+            self._queue = queue.Queue()
+            threading.Thread(target=self._pump, name="clinicalq-stdin", daemon=True).start()
+
+    def _pump(self) -> None:
+        while True:
+            line = self.stream.readline()
+            self._queue.put(line)
+            if line == "":
+                return
 
-def _wait_for_ready(event_cb: EventCallback | None, next_location: str) -> None:
-    _emit(
-        event_cb,
+    def readline(self, timeout: float) -> str | None:
+        """Return the next line, "" at EOF, or None if nothing arrived within timeout."""
+        if self._eof:
+            return ""
+        if self._queue is not None:
+            try:
+                line = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
+        else:
+            line = self._read_selected(timeout)
+            if line is None:
+                return None
+        if line == "":
+            self._eof = True
+        return line
+
+    def _read_selected(self, timeout: float) -> str | None:
+        deadline = time.monotonic() + timeout
+        while b"\n" not in self._pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._selector.select(timeout=remaining):
+                return None
+            data = os.read(self._fd, 4096)
+            if not data:  # EOF: flush a final unterminated line first.
+                line, self._pending = self._pending, b""
+                return line.decode("utf-8", errors="replace")
+            self._pending += data
+        line, _, self._pending = self._pending.partition(b"\n")
+        return line.decode("utf-8", errors="replace") + "\n"
+
+
+_stdin_reader: _StdinLines | None = None
+
+
+def _stdin_lines() -> _StdinLines:
+    # One reader per stdin stream, so lines read ahead survive between waits.
+    global _stdin_reader
+    if _stdin_reader is None or _stdin_reader.stream is not sys.stdin:
+        _stdin_reader = _StdinLines(sys.stdin)
+    return _stdin_reader
+
+
+def _wait_for_ready(emit: Emit, next_location: str) -> None:
+    emit(
         "reposition_waiting",
         next_location=next_location,
         message='Waiting for user readiness. Send {"command":"ready"} on stdin (one JSON line) to continue.',
     )
+    lines = _stdin_lines()
+    started = time.monotonic()
     while True:
-        line = sys.stdin.readline()
+        line = lines.readline(timeout=READY_POLL_SECONDS)
+        if line is None:
+            emit(
+                "reposition_heartbeat",
+                next_location=next_location,
+                waited_seconds=round(time.monotonic() - started, 1),
+            )
+            continue
         if line == "":  # EOF - avoid deadlock in non-interactive runs.
-            _emit(event_cb, "reposition_input_eof", next_location=next_location)
+            emit("reposition_input_eof", next_location=next_location)
             return
         text = line.strip()
         if not text:
@@ -251,47 +505,66 @@ def run_session(config: Dict[str, Any], event_cb: EventCallback | None = None) -
     reposition_mode = str(config.get("reposition_mode", "timer")).lower()
     live_bandpower = bool(config.get("live_bandpower", True))
     live_window_seconds = float(config.get("live_window_seconds", 2.0))
+    live_hop_seconds = float(config.get("live_hop_seconds", live_window_seconds / 2.0))
     channels = _resolve_channels(config)
     _validate_required_channels(channels)
 
     if reposition_mode not in {"timer", "manual"}:
         raise RuntimeError(f"Unsupported reposition_mode: {reposition_mode}. Use 'timer' or 'manual'.")
 
+    emit = _bind_emit(event_cb)
+
     board = create_board(config)
-    _emit(event_cb, "session_start", mode=mode)
+    emit("session_start", mode=mode)
 
     captures: List[EpochCapture] = []
+    # In real time, each epoch's FFTs run on a worker while the next epoch is
+    # acquired. fast_mode has no acquisition wait to hide them behind, so it
+    # keeps the single cross-epoch batch in _finalize_features.
+    feature_pool = None if fast_mode else ThreadPoolExecutor(max_workers=2, thread_name_prefix="clinicalq-features")
+    pending: List[Future] = []
+
+    def _record(cap: EpochCapture) -> None:
+        captures.append(cap)
+        if feature_pool is not None:
+            pending.append(feature_pool.submit(_finalize_features, [cap], board.sampling_rate))
 
     try:
         board.start()
-        _emit(event_cb, "board_ready", sampling_rate=board.sampling_rate, eeg_channels=board.eeg_channels)
+        emit("board_ready", sampling_rate=board.sampling_rate, eeg_channels=board.eeg_channels)
 
         if mode == "simultaneous":
-            sequence = _apply_epoch_seconds(CZ_SEQUENCE, epoch_seconds)
-            if bool(config.get("include_frontal_baseline", True)):
-                sequence.extend(_apply_epoch_seconds(SIMULTANEOUS_EXTRA, epoch_seconds))
+            sequence = _simultaneous_sequence(epoch_seconds, bool(config.get("include_frontal_baseline", True)))
 
             active_locations = ["Cz", "O1", "Fz", "F3", "F4"]
-            _emit(event_cb, "sequence_start", sequence="MASTER", locations=active_locations, total_epochs=len(sequence))
+            sorted_active = tuple(sorted(active_locations))
+            # Every epoch lands in one contiguous float32 block, (epoch, location, sample).
+            buffers = np.empty(
+                (len(sequence), len(active_locations), int(epoch_seconds * board.sampling_rate)), dtype=np.float32
+            )
+            emit("sequence_start", sequence="MASTER", locations=active_locations, total_epochs=len(sequence))
 
             for i, spec in enumerate(sequence):
                 next_spec = sequence[i + 1] if i + 1 < len(sequence) else None
-                captures.append(
+                _record(
                     _capture_epoch(
                         board,
                         channels,
                         "MASTER",
                         spec,
                         active_locations,
-                        event_cb,
+                        emit,
                         fast_mode=fast_mode,
                         live_bandpower=live_bandpower,
                         live_window_seconds=live_window_seconds,
+                        live_hop_seconds=live_hop_seconds,
                         next_spec=next_spec,
+                        out=buffers[i],
+                        sorted_locations=sorted_active,
                     )
                 )
 
-            _emit(event_cb, "sequence_complete", sequence="MASTER")
+            emit("sequence_complete", sequence="MASTER")
 
         elif mode == "sequential":
             order = config.get("sequential_order") or list(SEQUENTIAL_ORDER)
@@ -301,25 +574,28 @@ def run_session(config: Dict[str, Any], event_cb: EventCallback | None = None) -
                     "Sequential mode must record all required sites exactly once: " + ", ".join(REQUIRED_LOCATIONS)
                 )
 
-            for idx, location in enumerate(order):
-                sequence = _apply_epoch_seconds(_resolve_sequence(location), epoch_seconds)
+            sequences = [_sequence_for(location, epoch_seconds) for location in order]
+            buffers = np.empty(
+                (sum(len(seq) for seq in sequences), 1, int(epoch_seconds * board.sampling_rate)), dtype=np.float32
+            )
+            n_captured = 0
+
+            for idx, (location, sequence) in enumerate(zip(order, sequences)):
 
                 if idx > 0:
                     if reposition_mode == "manual":
-                        _emit(
-                            event_cb,
+                        emit(
                             "reposition_start",
                             next_location=location,
                             mode="manual",
                             seconds=None,
                             message=f"Move active electrode to {location}, then press Ready in the app.",
                         )
-                        _wait_for_ready(event_cb, location)
-                        _emit(event_cb, "reposition_complete", next_location=location, mode="manual")
+                        _wait_for_ready(emit, location)
+                        emit("reposition_complete", next_location=location, mode="manual")
                     else:
                         seconds = 0 if fast_mode else reposition_seconds
-                        _emit(
-                            event_cb,
+                        emit(
                             "reposition_start",
                             next_location=location,
                             mode="timer",
@@ -327,53 +603,64 @@ def run_session(config: Dict[str, Any], event_cb: EventCallback | None = None) -
                             message=f"Move active electrode to {location}.",
                         )
                         _countdown(
-                            event_cb,
+                            emit,
                             event="reposition_tick",
                             seconds=seconds,
                             next_location=location,
                         )
-                        _emit(event_cb, "reposition_complete", next_location=location, mode="timer")
+                        emit("reposition_complete", next_location=location, mode="timer")
 
-                _emit(event_cb, "sequence_start", sequence=location, locations=[location], total_epochs=len(sequence))
+                emit("sequence_start", sequence=location, locations=[location], total_epochs=len(sequence))
                 for j, spec in enumerate(sequence):
                     next_spec = sequence[j + 1] if j + 1 < len(sequence) else None
-                    captures.append(
+                    _record(
                         _capture_epoch(
                             board,
                             channels,
                             location,
                             spec,
                             [location],
-                            event_cb,
+                            emit,
                             fast_mode=fast_mode,
                             live_bandpower=live_bandpower,
                             live_window_seconds=live_window_seconds,
+                            live_hop_seconds=live_hop_seconds,
                             next_spec=next_spec,
+                            out=buffers[n_captured],
+                            sorted_locations=(location,),
                         )
                     )
-                _emit(event_cb, "sequence_complete", sequence=location)
+                    n_captured += 1
+                emit("sequence_complete", sequence=location)
 
         else:
             raise RuntimeError(f"Unsupported mode: {mode}")
 
     finally:
         board.stop()
-        _emit(event_cb, "board_stopped")
+        emit("board_stopped")
+        if feature_pool is not None:
+            feature_pool.shutdown(wait=True)
+
+    for future in pending:
+        future.result()
+    _finalize_features([cap for cap in captures if cap.raw], board.sampling_rate)
 
     session_data = {
         "mode": mode,
         "sampling_rate": board.sampling_rate,
         "epoch_seconds": epoch_seconds,
-        "channels": channels,
-        "epochs": [asdict(cap) for cap in captures],
+        "channels": dict(channels),
+        "epochs": [_capture_to_dict(cap) for cap in captures],
     }
+    # Analysis works on the packed table; the epoch dicts are kept for the JSON result.
+    session_data["feature_table"] = _feature_table(captures)
 
     session = analyze_session(session_data)
     result = session_result_to_dict(session)
     result["epoch_features"] = session_data["epochs"]
 
-    _emit(
-        event_cb,
+    emit(
         "analysis_complete",
         metrics=len(result.get("metrics", [])),
         out_of_range=result.get("summary", {}).get("out_of_range", 0),
@@ -1,13 +1,34 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List
 
+import numpy as np
+
 BandDict = Dict[str, float]
+# Feature keys in the order extract_features emits them, interned so every
+# feature dict in a session shares the same key objects.
+BAND_KEYS = tuple(
+    sys.intern(key)
+    for key in (
+        "delta",
+        "theta",
+        "alpha",
+        "lo_alpha",
+        "hi_alpha",
+        "smr",
+        "beta",
+        "hibeta",
+        "total_amp_basic",
+        "hibeta_plus_beta",
+        "peak_alpha",
+    )
+)
 EventCallback = Callable[[Dict[str, Any]], None]
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class EpochSpec:
     index: int
     label: str
@@ -22,10 +43,14 @@ class EpochCapture:
     label: str
     instruction: str
     seconds: int
-    features: Dict[str, BandDict]
+    features: Dict[str, BandDict] = field(default_factory=dict)
+    # The same features as a (n_locations, len(BAND_KEYS)) array, rows in ``features`` order.
+    features_arr: np.ndarray | None = field(default=None, repr=False)
+    # Raw per-location samples, held only until features are extracted in bulk.
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class MetricResult:
     location: str
     metric: str
@@ -38,9 +63,42 @@ class MetricResult:
     right_value: float | None = None
 
 
-@dataclass(slots=True)
+def metric_to_dict(metric: MetricResult) -> Dict[str, Any]:
+    # Spelled out rather than asdict()/fields() so serialization skips per-instance introspection.
+    return {
+        "location": metric.location,
+        "metric": metric.metric,
+        "value": metric.value,
+        "normal_range": metric.normal_range,
+        "status": metric.status,
+        "probe": metric.probe,
+        "formula": metric.formula,
+        "left_value": metric.left_value,
+        "right_value": metric.right_value,
+    }
+
+
+@dataclass(slots=True, frozen=True)
 class SessionResult:
     metadata: Dict[str, Any]
     metrics: List[MetricResult]
     summary: Dict[str, Any]
     derived: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SessionFeatureTable:
+    """Epoch features for a whole session as dense arrays, one column per epoch.
+
+    ``values[loc, band, epoch]`` is NaN wherever ``present`` is False;
+    ``captured[loc, epoch]`` marks which locations an epoch recorded at all.
+    """
+
+    locations: List[str]
+    bands: List[str]
+    sequences: np.ndarray
+    epoch_indices: np.ndarray
+    epoch_labels: np.ndarray
+    values: np.ndarray
+    present: np.ndarray
+    captured: np.ndarray
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from clinicalq_backend.analysis import analyze_session
+import numpy as np
+
+from clinicalq_backend.analysis import analyze_session, analyze_sessions, build_feature_table
 
 
 def _feature(
@@ -83,3 +85,86 @@ def test_analysis_generates_metrics_and_probes():
     assert result.summary["in_range"] > 0
     assert any("sleep" in probe.lower() for probe in result.summary["potential_symptom_questions"])
 
+
+def test_simultaneous_session_prefers_frontal_baseline_and_first_match():
+    def _master(index: int, label: str, feature: dict):
+        return {
+            "sequence": "MASTER",
+            "index": index,
+            "label": label,
+            "instruction": "",
+            "seconds": 15,
+            "features": {loc: feature for loc in ("Cz", "O1", "Fz", "F3", "F4")},
+        }
+
+    ec = _feature(theta=9, alpha=15, beta=4)
+    frontal = _feature(theta=4, alpha=3, beta=2)
+    epochs = [
+        _master(1, "EO", _feature(theta=8, alpha=10, beta=5)),
+        _master(2, "EO", _feature(theta=8, alpha=10, beta=5)),
+        _master(3, "EC", ec),
+        _master(4, "EO", _feature(theta=8, alpha=7, beta=5)),
+        _master(11, "FRONTAL_EC", frontal),
+        _master(11, "FRONTAL_EC", _feature(theta=1, alpha=1, beta=1)),
+    ]
+
+    result = analyze_session({"mode": "simultaneous", "epochs": epochs})
+
+    conditions = result.derived["conditions"]
+    assert conditions["Cz"]["EC"] == ec
+    assert conditions["O1"]["EC"] == ec
+    assert conditions["F3"]["EC"] == frontal
+    assert conditions["Fz"]["EC"] == frontal
+
+
+def test_epoch_lookup_coerces_index_once_and_leaves_input_untouched():
+    eo = _feature(theta=8, alpha=10, beta=5)
+    epochs = [
+        _epoch("O1", "1", "EO", "O1", eo),
+        _epoch("O1", "2", "EO", "O1", eo),
+        _epoch("O1", "3", "EC", "O1", _feature(theta=5, alpha=18, beta=4)),
+    ]
+    snapshot = [dict(ep) for ep in epochs]
+
+    result = analyze_session({"epochs": epochs})
+
+    assert result.derived["conditions"]["O1"]["EO"] == eo
+    assert result.derived["conditions"]["O1"]["EC"]["alpha"] == 18
+    assert epochs == snapshot
+
+
+def test_analyze_sessions_matches_serial_analysis_in_order():
+    sessions = [
+        {"epochs": [_epoch("F3", 1, "EC", "F3", _feature(theta=6, alpha=5, beta=2))]},
+        {"epochs": [_epoch("Fz", 1, "EC", "Fz", _feature(theta=6, alpha=9, beta=8, delta=10))]},
+        {"epochs": []},
+    ]
+
+    results = analyze_sessions(sessions, max_workers=2, chunksize=1)
+
+    assert len(results) == len(sessions)
+    for session, result in zip(sessions, results):
+        expected = analyze_session(session)
+        assert result.summary == expected.summary
+        assert [m.status for m in result.metrics] == [m.status for m in expected.metrics]
+
+
+def test_feature_table_packs_epochs_and_averages_missing_bands_as_nan():
+    partial = {"theta": 4.0, "alpha": 6.0}
+    epochs = [
+        _epoch("O1", 1, "EO", "O1", _feature(theta=6, alpha=8, beta=3)),
+        _epoch("O1", 2, "EO", "O1", partial),
+        _epoch("Cz", 1, "EO", "Cz", _feature(theta=8, alpha=10, beta=5)),
+    ]
+
+    table = build_feature_table(epochs)
+
+    assert table.locations == ["O1", "Cz"]
+    assert table.values.shape == (2, len(table.bands), 3)
+    assert table.captured.tolist() == [[True, True, False], [False, False, True]]
+    assert np.isnan(table.values[0, table.bands.index("beta"), 1])
+    assert not table.present[0, table.bands.index("beta"), 1]
+
+    eo = analyze_session({"feature_table": table}).derived["conditions"]["O1"]["EO"]
+    assert eo["alpha"] == 7.0
+    assert np.isnan(eo["beta"])
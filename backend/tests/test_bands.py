@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import numpy as np
+
+from clinicalq_backend.bands import BANDS, extract_feature_array, extract_features, extract_features_batch
+from clinicalq_backend.types import BAND_KEYS
+
+
+def _signals(n_signals: int = 3, n_samples: int = 750, sampling_rate: int = 250) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    t = np.arange(n_samples) / float(sampling_rate)
+    rows = [
+        (4.0 + i) * np.sin(2.0 * np.pi * (9.5 + i) * t) + 2.0 * np.sin(2.0 * np.pi * 5.0 * t)
+        + rng.normal(0.0, 0.5, size=n_samples)
+        for i in range(n_signals)
+    ]
+    return np.stack(rows)
+
+
+def test_batch_features_match_per_signal_features():
+    signals = _signals()
+    batch = extract_features_batch(signals, 250)
+
+    assert len(batch) == signals.shape[0]
+    for row, features in zip(signals, batch):
+        expected = extract_features(row, 250)
+        assert features.keys() == expected.keys()
+        for key, value in expected.items():
+            assert np.isclose(features[key], value, rtol=1e-6, atol=1e-9), key
+
+
+def test_flat_and_short_signals_have_zero_band_amplitudes():
+    for signal in (np.full(500, 3.5), np.zeros(2), np.full(8, np.nan)):
+        features = extract_features(signal, 250)
+        assert features["alpha"] == 0.0
+        assert features["total_amp_basic"] == 0.0
+
+
+def test_feature_dicts_use_the_shared_band_keys_in_order():
+    assert tuple(BANDS) == BAND_KEYS[: len(BANDS)]
+    features = extract_features(_signals(n_signals=1)[0], 250)
+    assert tuple(features) == BAND_KEYS
+    assert all(key is shared for key, shared in zip(features, BAND_KEYS))
+    assert features["total_amp_basic"] == features["theta"] + features["alpha"] + features["beta"]
+
+
+def test_feature_array_fills_a_preallocated_output_buffer():
+    signals = _signals()
+    out = np.full((signals.shape[0], len(BAND_KEYS)), np.nan)
+    assert extract_feature_array(signals, 250, out=out) is out
+    assert np.array_equal(out, extract_feature_array(signals, 250))
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+
+import pytest
+
+from clinicalq_backend import cli
+
+
+def test_emit_writes_one_json_line_per_event(capsysbinary):
+    cli._emit({"event": "epoch_tick", "seconds_remaining": 3})
+    cli._emit({"event": "bandpower", "features": {"Cz": {"alpha": 1.25}}})
+
+    lines = capsysbinary.readouterr().out.splitlines()
+    assert [json.loads(line)["event"] for line in lines] == ["epoch_tick", "bandpower"]
+    assert json.loads(lines[1])["features"]["Cz"]["alpha"] == 1.25
+
+
+def test_batched_emitter_writes_queued_events_in_order_on_close():
+    class _Stream(io.BytesIO):
+        writes = 0
+
+        def write(self, data):
+            _Stream.writes += 1
+            return super().write(data)
+
+    stream = _Stream()
+    emitter = cli.BatchedEmitter(stream, flush_seconds=60.0)
+    for remaining in (3, 2, 1):
+        emitter({"event": "epoch_tick", "seconds_remaining": remaining})
+    emitter.close()
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["seconds_remaining"] for line in lines] == [3, 2, 1]
+    assert _Stream.writes == 1
+
+
+def test_run_drains_queued_events_when_interrupted(monkeypatch, capsysbinary, tmp_path):
+    from clinicalq_backend import runner
+
+    def _interrupted(config, event_cb):
+        event_cb({"event": "epoch_tick", "seconds_remaining": 1})
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(runner, "run_session", _interrupted)
+    args = argparse.Namespace(config=None, output=str(tmp_path / "result.json"))
+    with pytest.raises(KeyboardInterrupt):
+        cli.cmd_run(args)
+
+    lines = capsysbinary.readouterr().out.splitlines()
+    assert [json.loads(line)["event"] for line in lines] == ["epoch_tick"]
+
+
+def test_batched_emitter_raises_drain_errors_and_keeps_valid_events():
+    stream = io.BytesIO()
+    emitter = cli.BatchedEmitter(stream, flush_seconds=0.01)
+    emitter({"event": "epoch_tick", "seconds_remaining": 2})
+    emitter({"event": "bandpower", "features": object()})
+    emitter._thread.join(timeout=5.0)
+
+    with pytest.raises(TypeError):
+        emitter({"event": "epoch_tick", "seconds_remaining": 1})
+    emitter({"event": "epoch_complete"})
+    emitter.close()
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["event"] for line in lines] == ["epoch_tick", "epoch_complete"]
+
+
+def test_batched_emitter_raises_from_close_when_the_stream_is_gone():
+    class _ClosedPipe(io.BytesIO):
+        def write(self, data):
+            raise BrokenPipeError
+
+    emitter = cli.BatchedEmitter(_ClosedPipe(), flush_seconds=0.01)
+    emitter({"event": "epoch_tick", "seconds_remaining": 1})
+    emitter._thread.join(timeout=5.0)
+
+    with pytest.raises(BrokenPipeError):
+        emitter.close()
+
+
+def test_run_reports_an_error_event_when_an_event_cannot_be_written(monkeypatch, capsysbinary, tmp_path):
+    from clinicalq_backend import runner
+
+    def _unserializable(config, event_cb):
+        event_cb({"event": "bandpower", "features": object()})
+        return {}
+
+    monkeypatch.setattr(runner, "run_session", _unserializable)
+    args = argparse.Namespace(config=None, output=str(tmp_path / "result.json"))
+
+    assert cli.cmd_run(args) == 1
+    lines = capsysbinary.readouterr().out.splitlines()
+    assert [json.loads(line)["event"] for line in lines] == ["error"]
+    assert not (tmp_path / "result.json").exists()
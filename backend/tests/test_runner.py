@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import sys
+import threading
+from typing import Dict
+
+import numpy as np
+import pytest
+
+from clinicalq_backend.analysis import build_feature_table
+from clinicalq_backend.bands import extract_features
+from clinicalq_backend import runner
+from clinicalq_backend.runner import (
+    DEFAULT_CHANNELS,
+    _bind_emit,
+    _capture_epoch,
+    _capture_to_dict,
+    _countdown,
+    _feature_table,
+    _finalize_features,
+    _validate_required_channels,
+    _wait_for_ready,
+    run_session,
+)
+from clinicalq_backend.types import EpochCapture, EpochSpec
+
+
+def _simulated_config(mode: str) -> dict:
+    return {
+        "mode": mode,
+        "epoch_seconds": 2,
+        "fast_mode": True,
+        "board": {"use_synthetic": True, "seed": 3},
+    }
+
+
+def test_simulated_sequential_session_runs_end_to_end():
+    events = []
+    result = run_session(_simulated_config("sequential"), event_cb=events.append)
+
+    names = [event["event"] for event in events]
+    assert names[0] == "session_start"
+    assert names[-1] == "analysis_complete"
+    assert names.count("epoch_complete") == len(result["epoch_features"]) == 17
+    assert all(type(event["captured_locations"]) is list for event in events if event["event"] == "epoch_complete")
+    assert "bandpower" in names
+    assert len(result["metrics"]) >= 25
+
+
+def test_block_capture_fallback_gathers_every_active_location():
+    events = []
+    config = {**_simulated_config("simultaneous"), "live_bandpower": False}
+    result = run_session(config, event_cb=events.append)
+
+    assert "bandpower" not in {event["event"] for event in events}
+    assert len(result["epoch_features"]) == 11
+    for epoch in result["epoch_features"]:
+        assert list(epoch["features"]) == ["Cz", "O1", "Fz", "F3", "F4"]
+        assert all(features["alpha"] > 0.0 for features in epoch["features"].values())
+
+
+def test_headless_session_skips_live_bandpower_work(monkeypatch):
+    calls = []
+    original = runner._features_by_location
+    monkeypatch.setattr(runner, "_features_by_location", lambda *a, **kw: calls.append(a) or original(*a, **kw))
+
+    result = run_session(_simulated_config("sequential"))
+
+    assert calls == []
+    assert len(result["epoch_features"]) == 17
+
+
+def test_feature_table_from_captures_matches_packing_the_epoch_dicts(monkeypatch):
+    captured = []
+    original = runner._feature_table
+    monkeypatch.setattr(runner, "_feature_table", lambda caps: captured.extend(caps) or original(caps))
+    result = run_session(_simulated_config("simultaneous"))
+
+    direct = _feature_table(captured)
+    packed = build_feature_table(result["epoch_features"])
+    assert direct.locations == packed.locations
+    assert direct.bands == packed.bands
+    np.testing.assert_array_equal(direct.values, packed.values)
+    np.testing.assert_array_equal(direct.present, packed.present)
+    assert direct.sequences.tolist() == packed.sequences.tolist()
+    assert direct.epoch_labels.tolist() == packed.epoch_labels.tolist()
+
+
+def test_channel_validation_reports_missing_before_invalid_before_duplicates():
+    with pytest.raises(RuntimeError, match="Missing required channel mappings: F4"):
+        _validate_required_channels({"Cz": 1, "O1": 0, "Fz": 1, "F3": 4})
+    with pytest.raises(RuntimeError, match="Invalid channel index"):
+        _validate_required_channels({**DEFAULT_CHANNELS, "O1": 0, "Fz": 1})
+    with pytest.raises(RuntimeError, match="Cz and Fz both map to channel 1"):
+        _validate_required_channels({**DEFAULT_CHANNELS, "Fz": 1})
+    _validate_required_channels(DEFAULT_CHANNELS)
+
+
+def test_capture_to_dict_shares_features_and_stays_json_serializable():
+    features = {"Cz": extract_features(np.sin(np.arange(500) / 10.0), 250)}
+    cap = EpochCapture(sequence="Cz", index=1, label="EO", instruction="", seconds=2, features=features)
+
+    as_dict = _capture_to_dict(cap)
+
+    assert as_dict["features"] is features
+    assert json.loads(json.dumps(as_dict))["features"] == features
+
+
+def test_realtime_session_overlaps_feature_extraction_with_identical_results(monkeypatch):
+    monkeypatch.setattr(runner.time, "sleep", lambda seconds: None)
+    config = {**_simulated_config("sequential"), "reposition_seconds": 0}
+    batched = run_session(config)
+    realtime = run_session({**config, "fast_mode": False})
+
+    assert realtime["epoch_features"] == batched["epoch_features"]
+    assert realtime["metrics"] == batched["metrics"]
+
+
+class _BurstyBoard:
+    """Streams more samples per read than a wall-clock second would hold."""
+
+    sampling_rate = 100
+
+    def __init__(self, burst: int):
+        self.burst = burst
+        self.eeg_channels = [1]
+        self.reads = 0
+
+    def flush(self) -> None:
+        return
+
+    def read_chunk(self, n_samples: int, label: str) -> Dict[int, np.ndarray]:
+        start = self.reads * self.burst
+        self.reads += 1
+        return {1: np.arange(start, start + self.burst, dtype=float)}
+
+
+def test_streaming_capture_keeps_leading_samples_when_board_overdelivers():
+    events = []
+    board = _BurstyBoard(burst=150)
+    capture = _capture_epoch(
+        board,
+        dict(DEFAULT_CHANNELS),
+        "Cz",
+        EpochSpec(1, "EO", "", 2),
+        ["Cz"],
+        _bind_emit(events.append),
+        fast_mode=True,
+        live_bandpower=True,
+        live_window_seconds=1.0,
+        next_spec=None,
+    )
+
+    assert board.reads == 2
+    np.testing.assert_array_equal(capture.raw["Cz"], np.arange(200, dtype=float))
+    _finalize_features([capture], board.sampling_rate)
+    expected = extract_features(np.arange(200, dtype=float), board.sampling_rate)
+    assert capture.features["Cz"] == pytest.approx(expected)
+    assert capture.raw == {}
+    assert sum(1 for event in events if event["event"] == "bandpower") == 2
+
+
+def test_live_bandpower_reuses_features_until_a_full_hop_arrives():
+    events = []
+    _capture_epoch(
+        _BurstyBoard(burst=100),
+        dict(DEFAULT_CHANNELS),
+        "Cz",
+        EpochSpec(1, "EO", "", 4),
+        ["Cz"],
+        _bind_emit(events.append),
+        fast_mode=True,
+        live_bandpower=True,
+        live_window_seconds=2.0,
+        live_hop_seconds=2.0,
+        next_spec=None,
+    )
+
+    live = [event["features"]["Cz"] for event in events if event["event"] == "bandpower"]
+    assert len(live) == 4
+    assert live[1] == live[0]
+    assert live[2] != live[1]
+    assert live[3] == live[2]
+
+
+class _UnevenBoard(_BurstyBoard):
+    """Alternates reads one sample short of and exactly at the sampling rate."""
+
+    def read_chunk(self, n_samples: int, label: str) -> Dict[int, np.ndarray]:
+        size = self.sampling_rate - 1 if self.reads % 2 == 0 else self.sampling_rate
+        self.reads += 1
+        return {1: np.random.default_rng(self.reads).normal(size=size)}
+
+
+def test_live_bandpower_recomputes_every_hop_despite_uneven_chunk_sizes():
+    events = []
+    _capture_epoch(
+        _UnevenBoard(burst=0),
+        dict(DEFAULT_CHANNELS),
+        "Cz",
+        EpochSpec(1, "EO", "", 7),
+        ["Cz"],
+        _bind_emit(events.append),
+        fast_mode=True,
+        live_bandpower=True,
+        live_window_seconds=2.0,
+        next_spec=None,
+    )
+
+    assert [event["event"] for event in events[:3]] == ["epoch_start", "epoch_tick", "bandpower"]
+    live = [event["features"]["Cz"] for event in events if event["event"] == "bandpower"]
+    assert len(live) == 7
+    assert all(current != previous for previous, current in zip(live, live[1:]))
+
+
+class _ReadEpochOnlyBoard:
+    """Duck-typed board that only implements the original read_epoch contract."""
+
+    sampling_rate = 100
+
+    def __init__(self, n_samples: int):
+        self.n_samples = n_samples
+
+    def read_epoch(self, seconds: int, label: str, on_tick=None) -> Dict[int, np.ndarray]:
+        if on_tick:
+            on_tick(0)
+        return {ch: np.arange(self.n_samples, dtype=float) + ch for ch in (1, 2)}
+
+
+def test_block_capture_falls_back_to_read_epoch_on_boards_without_read_epoch_array():
+    events = []
+    capture = _capture_epoch(
+        _ReadEpochOnlyBoard(n_samples=200),
+        dict(DEFAULT_CHANNELS),
+        "Cz",
+        EpochSpec(1, "EO", "", 2),
+        ["Cz", "O1", "Fz"],
+        _bind_emit(events.append),
+        fast_mode=True,
+        live_bandpower=False,
+        live_window_seconds=1.0,
+        next_spec=None,
+    )
+
+    assert list(capture.raw) == ["Cz", "O1"]
+    np.testing.assert_array_equal(capture.raw["O1"], np.arange(200, dtype=float) + 2)
+    assert [event["event"] for event in events] == ["epoch_start", "epoch_tick", "epoch_complete"]
+    assert events[-1]["captured_locations"] == ["Cz", "O1"]
+
+
+def test_block_capture_keeps_the_length_the_board_returned():
+    for n_samples in (150, 260):
+        capture = _capture_epoch(
+            _ReadEpochOnlyBoard(n_samples=n_samples),
+            dict(DEFAULT_CHANNELS),
+            "Cz",
+            EpochSpec(1, "EO", "", 2),
+            ["Cz"],
+            _bind_emit(None),
+            fast_mode=True,
+            live_bandpower=False,
+            live_window_seconds=1.0,
+            next_spec=None,
+            out=np.zeros((1, 200), dtype=np.float32),
+        )
+
+        np.testing.assert_array_equal(capture.raw["Cz"], np.arange(n_samples, dtype=float) + 1)
+
+
+def test_wait_for_ready_skips_other_commands_on_non_file_stdin(monkeypatch):
+    monkeypatch.setattr(
+        sys, "stdin", io.StringIO('noise\n{"command": "ready", "next_location": "F3"}\n{"command": "ready"}\n')
+    )
+    events = []
+
+    _wait_for_ready(_bind_emit(events.append), "Cz")
+
+    assert [event["event"] for event in events] == ["reposition_waiting"]
+
+
+def test_wait_for_ready_heartbeats_and_keeps_read_ahead_lines(monkeypatch):
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "r") as stdin:
+        monkeypatch.setattr(sys, "stdin", stdin)
+        monkeypatch.setattr(runner, "READY_POLL_SECONDS", 0.02)
+        timer = threading.Timer(0.15, os.write, args=(write_fd, b"ready\nok\n"))
+        timer.start()
+        events = []
+
+        _wait_for_ready(_bind_emit(events.append), "Cz")
+        _wait_for_ready(_bind_emit(events.append), "F3")
+        os.close(write_fd)
+        _wait_for_ready(_bind_emit(events.append), "F4")
+        timer.join()
+
+    names = [event["event"] for event in events]
+    assert names[0] == "reposition_waiting"
+    assert "reposition_heartbeat" in names
+    assert names[-3:] == ["reposition_waiting", "reposition_waiting", "reposition_input_eof"]
+
+
+def test_countdown_sleeps_to_deadlines_despite_slow_callbacks(monkeypatch):
+    clock = [0.0]
+    sleeps = []
+
+    def _sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    def _slow_cb(event):
+        clock[0] += 0.25
+
+    monkeypatch.setattr(runner.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(runner.time, "sleep", _sleep)
+    _countdown(_bind_emit(_slow_cb), "reposition_tick", 3)
+
+    assert sleeps == pytest.approx([0.75, 0.75, 0.75])
+    assert clock[0] == pytest.approx(3.0)
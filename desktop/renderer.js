@@ -78,7 +78,7 @@ const resultState = {
 };
 
 function shouldLogEvent(name) {
-  return !["epoch_tick", "reposition_tick", "bandpower"].includes(String(name || ""));
+  return !["epoch_tick", "reposition_tick", "reposition_heartbeat", "bandpower"].includes(String(name || ""));
 }
 
 function cueLeadSeconds() {
@@ -488,6 +488,7 @@ function buildConfig() {
     reposition_mode: manualAdvance ? "manual" : "timer",
     live_bandpower: true,
     live_window_seconds: 2.0,
+    live_hop_seconds: 1.0,
     sampling_rate: 250,
     fast_mode: refs.fastMode.checked,
     include_frontal_baseline: refs.includeFrontalBaseline.checked,
@@ -770,7 +771,7 @@ window.clinicalQ.onSessionEvent((event) => {
   if (shouldLogEvent(event.event)) {
     appendEventRow(text);
   }
-  if (!["epoch_tick", "reposition_tick", "bandpower"].includes(event.event)) {
+  if (!["epoch_tick", "reposition_tick", "reposition_heartbeat", "bandpower"].includes(event.event)) {
     refs.liveEvent.textContent = text;
   }
 });